@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+from dataclasses import asdict
 from datetime import datetime, timedelta
 from data.models import Flight, Hotel, CarRental, TravelRequest
 from data.crawler import MockCrawler, GoogleFlightsCrawler, AmadeusCrawler
@@ -88,7 +89,7 @@ if provider == "Amadeus API":
 # Limpeza de input
 origens = [c.strip() for c in origens if c.strip()]
 destinos = [c.strip() for c in destinos if c.strip()]
-todas_cidades = list(set(origens + destinos + obrigatorias))
+todas_cidades = list(dict.fromkeys(origens + destinos + obrigatorias))
 
 # --- Cost Parameters (Global) ---
 st.sidebar.markdown("---")
@@ -147,6 +148,8 @@ if st.button("🚀 Calcular Melhor Roteiro", type="primary"):
                     flights.extend(new_flights)
             except Exception as e:
                 print(f"Error fetching from {orig_city}: {e}")
+        # The pooled browser sessions served every origin above; release them
+        crawler.close()
         
         # Original fallback logic was too simplistic, assume above works for Mock
         if not flights and provider != "Mock Data":
@@ -209,6 +212,7 @@ if st.button("🚀 Calcular Melhor Roteiro", type="primary"):
             
             hotels = crawler.fetch_hotels(todas_cidades)
             cars = crawler.fetch_car_rentals(todas_cidades)
+            crawler.close()
         else:
             # Mock hotels and cars for now
             hotels = []
@@ -218,13 +222,13 @@ if st.button("🚀 Calcular Melhor Roteiro", type="primary"):
         
         # DEBUG: Save to CSV
         if flights:
-            df_debug = pd.DataFrame([f.__dict__ for f in flights])
+            df_debug = pd.DataFrame([asdict(f) for f in flights])
             df_debug.to_csv("flights_captured.csv", index=False)
             st.success("Dados salvos em 'flights_captured.csv'")
             print(f"Saved {len(flights)} flights to flights_captured.csv")
 
         # 2. Otimização
-        status.write("🧠 Executando Solver (TSP + MTZ)...")
+        status.write("🧠 Executando Solver (TSP + SEC)...")
         
         req = TravelRequest(
             origin_cities=origens,
@@ -94,7 +94,8 @@ def solve_trip(
     dest_cities = [c for c in request.destination_cities if c.strip()]
     mandatory = [c for c in request.mandatory_cities if c.strip()]
     
-    all_cities = list(set(origin_cities + dest_cities + mandatory))
+    # dict.fromkeys dedups in first-seen order, so the crawl order is reproducible
+    all_cities = list(dict.fromkeys(origin_cities + dest_cities + mandatory))
     flights = []
     
     cached_flights_set = set() # Track cached items
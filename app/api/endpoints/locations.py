@@ -35,8 +35,8 @@ async def validate_locations(
     Returns a list of invalid entries.
     """
     invalid = []
-    # Deduplicate to avoid redundant checks
-    terms = list(set(t.strip() for t in q if t.strip()))
+    # Deduplicate to avoid redundant checks, keeping the caller's order
+    terms = list(dict.fromkeys(t.strip() for t in q if t.strip()))
     
     for term in terms:
         resolved = service.resolve_iata(term)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from typing import List, Optional
 from datetime import datetime
 
@@ -71,10 +71,15 @@ class ItineraryLeg(BaseModel):
     flight: Optional[Flight]
     price: float
     duration: int
-    price_formatted: str
     origin_coords: Optional[List[float]] = None
     dest_coords: Optional[List[float]] = None
 
+    # Formatted on serialization only, instead of once per leg while building the itinerary
+    @computed_field
+    @property
+    def price_formatted(self) -> str:
+        return f"R$ {self.price:.2f}"
+
 class SolverResult(BaseModel):
     status: str
     itinerary: List[ItineraryLeg]
@@ -0,0 +1,122 @@
+"""
+Static airport table used by LocationService.
+
+Rows are (iata, name, city, country, lat, lon), curated from major world
+cities and all Brazilian hubs. Kept as plain tuples so the module loads
+without building any objects.
+"""
+
+from typing import Tuple
+
+AirportRow = Tuple[str, str, str, str, float, float]
+
+# Top Global + Brazil Hubs
+AIRPORTS_TUPLE: Tuple[AirportRow, ...] = (
+    # BRAZIL
+    ("GRU", "Guarulhos Intl", "São Paulo", "BR", -23.4356, -46.4731),
+    ("CGH", "Congonhas", "São Paulo", "BR", -23.6261, -46.6564),
+    ("VCP", "Viracopos", "Campinas", "BR", -23.0069, -47.1344),
+    ("GIG", "Galeão Intl", "Rio de Janeiro", "BR", -22.81, -43.2506),
+    ("SDU", "Santos Dumont", "Rio de Janeiro", "BR", -22.9105, -43.1631),
+    ("BSB", "Juscelino Kubitschek Intl", "Brasília", "BR", -15.8697, -47.9172),
+    ("CNF", "Confins Intl", "Belo Horizonte", "BR", -19.6244, -43.9719),
+    ("PLU", "Pampulha", "Belo Horizonte", "BR", -19.8519, -43.9506),
+    ("SSA", "Deputado Luís Eduardo Magalhães", "Salvador", "BR", -12.9086, -38.3225),
+    ("FOR", "Pinto Martins Intl", "Fortaleza", "BR", -3.7763, -38.5326),
+    ("REC", "Guararapes Intl", "Recife", "BR", -8.1256, -34.923),
+    ("POA", "Salgado Filho Intl", "Porto Alegre", "BR", -29.9939, -51.1711),
+    ("CWB", "Afonso Pena Intl", "Curitiba", "BR", -25.5317, -49.1758),
+    ("BEL", "Val de Cans Intl", "Belém", "BR", -1.3847, -48.4788),
+    ("MAO", "Eduardo Gomes Intl", "Manaus", "BR", -3.0386, -60.0506),
+    ("GYN", "Santa Genoveva", "Goiânia", "BR", -16.6267, -49.2211),
+    ("CGR", "Campo Grande Intl", "Campo Grande", "BR", -20.4697, -54.6703),
+    ("CGB", "Marechal Rondon Intl", "Cuiabá", "BR", -15.6528, -56.1167),
+    ("VIX", "Eurico de Aguiar Salles", "Vitória", "BR", -20.2581, -40.2864),
+    ("FLN", "Hercílio Luz Intl", "Florianópolis", "BR", -27.6703, -48.5525),
+    ("MCZ", "Zumbi dos Palmares Intl", "Maceió", "BR", -9.5108, -35.7917),
+    ("NAT", "São Gonçalo do Amarante Intl", "Natal", "BR", -5.7689, -35.3664),
+    ("BVB", "Boa Vista Intl", "Boa Vista", "BR", 2.8461, -60.7061),
+    ("PVH", "Governador Jorge Teixeira Intl", "Porto Velho", "BR", -8.7136, -63.9028),
+    ("MCP", "Alberto Alcolumbre Intl", "Macapá", "BR", 0.0506, -51.0722),
+    ("PMW", "Palmas", "Palmas", "BR", -10.29, -48.3578),
+    ("IOS", "Jorge Amado", "Ilhéus", "BR", -14.8158, -39.0333),
+    ("UDI", "Ten. Cel. Av. César Bombonato", "Uberlândia", "BR", -18.8836, -48.2253),
+    ("RAO", "Leite Lopes", "Ribeirão Preto", "BR", -21.1364, -47.7761),
+    ("SJP", "Prof. Eribelto Manoel Reino", "São José do Rio Preto", "BR", -20.8161, -49.4053),
+    ("LDB", "Londrina", "Londrina", "BR", -23.3303, -51.1303),
+    ("MGF", "Maringá Regional", "Maringá", "BR", -23.4794, -51.9161),
+    ("JOI", "Joinville", "Joinville", "BR", -26.2231, -48.7978),
+    ("NVT", "Ministro Victor Konder Intl", "Navegantes", "BR", -26.8789, -48.6514),
+    ("XAP", "Serafin Enoss Bertaso", "Chapecó", "BR", -27.1339, -52.6619),
+    ("FML", "Fortaleza-CE", "Fortaleza", "BR", -3.7761, -38.5326),
+    ("IMP", "Prefeito Renato Moreira", "Imperatriz", "BR", -5.5306, -47.4589),
+    ("THE", "Senador Petrônio Portella", "Teresina", "BR", -5.0606, -42.8239),
+    # AMERICAS
+    ("EZE", "Ministro Pistarini Intl", "Buenos Aires", "AR", -34.8222, -58.5358),
+    ("AEP", "Jorge Newbery", "Buenos Aires", "AR", -34.5592, -58.4156),
+    ("COR", "Ingeniero Aeronáutico Ambrosio L.V. Taravella Intl", "Córdoba", "AR", -31.3236, -64.2081),
+    ("SCL", "Arturo Merino Benítez Intl", "Santiago", "CL", -33.393, -70.7858),
+    ("LIM", "Jorge Chávez Intl", "Lima", "PE", -12.0219, -77.1143),
+    ("BOG", "El Dorado Intl", "Bogotá", "CO", 4.7016, -74.1469),
+    ("MIA", "Miami Intl", "Miami", "US", 25.7959, -80.287),
+    ("MCO", "Orlando Intl", "Orlando", "US", 28.4289, -81.316),
+    ("JFK", "John F. Kennedy Intl", "New York", "US", 40.6413, -73.7781),
+    ("EWR", "Newark Liberty Intl", "Newark", "US", 40.6895, -74.1745),
+    ("LGA", "LaGuardia", "New York", "US", 40.7772, -73.8726),
+    ("LAX", "Los Angeles Intl", "Los Angeles", "US", 33.9416, -118.4085),
+    ("SFO", "San Francisco Intl", "San Francisco", "US", 37.6189, -122.375),
+    ("SEA", "Seattle-Tacoma Intl", "Seattle", "US", 47.449, -122.309),
+    ("ORD", "O'Hare Intl", "Chicago", "US", 41.9742, -87.9073),
+    ("DFW", "Dallas/Fort Worth Intl", "Dallas", "US", 32.8998, -97.0403),
+    ("ATL", "Hartsfield-Jackson Atlanta Intl", "Atlanta", "US", 33.6407, -84.4277),
+    ("MEX", "Benito Juárez Intl", "Mexico City", "MX", 19.4361, -99.0719),
+    ("CUN", "Cancún Intl", "Cancún", "MX", 21.0365, -86.8771),
+    ("PTY", "Tocumen Intl", "Panama City", "PA", 9.0714, -79.3835),
+    ("YYZ", "Toronto Pearson Intl", "Toronto", "CA", 43.6777, -79.6248),
+    ("YVR", "Vancouver Intl", "Vancouver", "CA", 49.1967, -123.1815),
+    # EUROPE
+    ("CDG", "Charles de Gaulle", "Paris", "FR", 49.0097, 2.5479),
+    ("ORY", "Orly", "Paris", "FR", 48.7233, 2.3794),
+    ("LHR", "Heathrow", "London", "GB", 51.47, -0.4543),
+    ("LGW", "Gatwick", "London", "GB", 51.1481, -0.1903),
+    ("FRA", "Frankfurt Intl", "Frankfurt", "DE", 50.0379, 8.5622),
+    ("MUC", "Munich", "Munich", "DE", 48.3537, 11.775),
+    ("TXL", "Tegel", "Berlin", "DE", 52.5597, 13.2877),
+    ("BER", "Berlin Brandenburg", "Berlin", "DE", 52.3514, 13.5133),
+    ("MAD", "Adolfo Suárez Madrid–Barajas", "Madrid", "ES", 40.4719, -3.5626),
+    ("BCN", "Josep Tarradellas Barcelona–El Prat", "Barcelona", "ES", 41.2974, 2.0833),
+    ("FCO", "Leonardo da Vinci–Fiumicino", "Rome", "IT", 41.8003, 12.2389),
+    ("MXP", "Malpensa", "Milan", "IT", 45.63, 8.7231),
+    ("VCE", "Venice Marco Polo", "Venice", "IT", 45.5053, 12.3519),
+    ("LIS", "Humberto Delgado", "Lisbon", "PT", 38.7742, -9.1342),
+    ("OPO", "Francisco Sá Carneiro", "Porto", "PT", 41.2424, -8.6786),
+    ("AMS", "Schiphol", "Amsterdam", "NL", 52.3105, 4.7683),
+    ("ZRH", "Zurich", "Zurich", "CH", 47.4581, 8.5481),
+    ("GVA", "Geneva", "Geneva", "CH", 46.2381, 6.1089),
+    ("DUB", "Dublin", "Dublin", "IE", 53.4214, -6.27),
+    ("VIE", "Vienna Intl", "Vienna", "AT", 48.1103, 16.5697),
+    ("CPH", "Copenhagen", "Copenhagen", "DK", 55.6179, 12.656),
+    ("ARN", "Stockholm Arlanda", "Stockholm", "SE", 59.6519, 17.9186),
+    ("OSL", "Oslo Gardermoen", "Oslo", "NO", 60.1939, 11.1006),
+    ("HEL", "Helsinki-Vantaa", "Helsinki", "FI", 60.3172, 24.9633),
+    # ASIA / OCEANIA / AFRICA
+    ("DXB", "Dubai Intl", "Dubai", "AE", 25.2532, 55.3657),
+    ("AUH", "Abu Dhabi Intl", "Abu Dhabi", "AE", 24.4331, 54.6511),
+    ("DOH", "Hamad Intl", "Doha", "QA", 25.2731, 51.6081),
+    ("HND", "Haneda", "Tokyo", "JP", 35.5494, 139.7797),
+    ("NRT", "Narita Intl", "Tokyo", "JP", 35.7647, 140.3864),
+    ("KIX", "Kansai Intl", "Osaka", "JP", 34.4347, 135.2444),
+    ("ICN", "Incheon Intl", "Seoul", "KR", 37.4691, 126.4506),
+    ("SIN", "Changi", "Singapore", "SG", 1.3644, 103.9915),
+    ("HKG", "Hong Kong Intl", "Hong Kong", "HK", 22.3089, 113.9141),
+    ("PEK", "Beijing Capital Intl", "Beijing", "CN", 40.08, 116.5844),
+    ("PVG", "Shanghai Pudong Intl", "Shanghai", "CN", 31.1444, 121.8083),
+    ("BKK", "Suvarnabhumi", "Bangkok", "TH", 13.6925, 100.75),
+    ("SYD", "Sydney Kingsford Smith", "Sydney", "AU", -33.9461, 151.1772),
+    ("MEL", "Melbourne", "Melbourne", "AU", -37.6733, 144.8433),
+    ("AKL", "Auckland", "Auckland", "NZ", -37.0081, 174.7917),
+    ("JNB", "O. R. Tambo Intl", "Johannesburg", "ZA", -26.1392, 28.246),
+    ("CPT", "Cape Town Intl", "Cape Town", "ZA", -33.9715, 18.6021),
+    ("DEL", "Indira Gandhi Intl", "Delhi", "IN", 28.5665, 77.1031),
+    ("BOM", "Chhatrapati Shivaji Maharaj Intl", "Mumbai", "IN", 19.0886, 72.8681),
+)
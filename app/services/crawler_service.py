@@ -1,9 +1,11 @@
 import random
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from app.schemas.travel import Flight, Hotel, CarRental
 from app.services.location_service import get_location_service
+from data.database import FlightCache
 
 # Try importing Selenium
 try:
@@ -32,12 +34,22 @@ class BaseCrawler(ABC):
         pass
 
 
+# Concurrent per-hotel offer requests when a batched lookup is rejected
+HOTEL_OFFER_WORKERS = 8
+# Per-hotel offer responses that mean the ID itself is invalid or has no offers
+NO_OFFER_STATUSES = {400, 404}
+
+
 class AmadeusCrawler(BaseCrawler):
     def __init__(self, client_id: str, client_secret: str, production: bool = False):
         self.production = production
         self.client_id = client_id
         self.client_secret = client_secret
         self.client_ready = False
+        # Hotel IDs already queried for offers during the current fetch_hotels call
+        self._seen_hotel_ids = set()
+        # Remembers hotel IDs without offers across runs, so they are not queried again for a day
+        self._cache = FlightCache()
 
         try:
             from amadeus import Client
@@ -129,6 +141,7 @@ class AmadeusCrawler(BaseCrawler):
             return []
 
         all_hotels = []
+        self._seen_hotel_ids = set()
         
         for city in cities:
             try:
@@ -147,47 +160,39 @@ class AmadeusCrawler(BaseCrawler):
 
                 # Take top 10 hotels to check offers (API limits usually exist)
                 top_hotels = hotels_response.data[:10]
-                hotel_ids = [h['hotelId'] for h in top_hotels]
+                # Dedup (order-preserving) and skip IDs already queried for another city
+                # or known to have returned no offers recently
+                hotel_ids = [
+                    h_id for h_id in dict.fromkeys(h['hotelId'] for h in top_hotels)
+                    if h_id not in self._seen_hotel_ids and not self._cache.is_negative(h_id)
+                ]
+                self._seen_hotel_ids.update(hotel_ids)
                 
                 if not hotel_ids:
                     continue
 
                 # Step 2: Get Offers for these hotels
-                # Fetch individually to avoid batch failure if one ID is invalid (common Amadeus issue)
-                for h_id in hotel_ids:
-                    try:
-                        offers_response = self.amadeus.shopping.hotel_offers_search.get(
-                            hotelIds=h_id,
-                            adults=1,
-                            currency='BRL'
-                        )
-                        
-                        if offers_response.data:
-                            for offer in offers_response.data:
-                                hotel_data = offer.get('hotel', {})
-                                name = hotel_data.get('name', 'Unknown Hotel')
-                                
-                                offers = offer.get('offers', [])
-                                if not offers: continue
-                                
-                                price = float(offers[0]['price']['total'])
-                                
-                                rating = hotel_data.get('rating')
-                                if not rating: rating = 3.0
-                                else:
-                                    try: rating = float(rating)
-                                    except: rating = 3.0
-
-                                all_hotels.append(Hotel(
-                                    city=city,
-                                    name=name,
-                                    price_per_night=price,
-                                    rating=rating
-                                ))
-                    except Exception as loop_e:
-                        # Log specific hotel failure but continue
-                        # print(f"Failed for hotel {h_id}: {loop_e}")
-                        pass
+                # One batched call for all IDs; an invalid ID fails the whole batch
+                # (common Amadeus issue), so then fetch them individually, in parallel
+                try:
+                    offers = self._hotel_offers(",".join(hotel_ids))
+                    answered = hotel_ids
+                except Exception:
+                    with ThreadPoolExecutor(max_workers=HOTEL_OFFER_WORKERS) as pool:
+                        per_hotel = list(pool.map(self._hotel_offers_or_none, hotel_ids))
+                    offers = [offer for hotel_offers in per_hotel if hotel_offers for offer in hotel_offers]
+                    answered = [h_id for h_id, hotel_offers in zip(hotel_ids, per_hotel) if hotel_offers is not None]
+
+                priced_ids = set()
+                for offer in offers:
+                    hotel = self._offer_to_hotel(city, offer)
+                    if hotel is not None:
+                        all_hotels.append(hotel)
+                        priced_ids.add(offer.get('hotel', {}).get('hotelId'))
+                # Hotels the API answered for without a priced offer are skipped next time
+                for h_id in answered:
+                    if h_id not in priced_ids:
+                        self._cache.mark_negative(h_id)
 
             except Exception as e:
                 print(f"Amadeus Hotel Error for {city}: {e}")
@@ -199,6 +204,55 @@ class AmadeusCrawler(BaseCrawler):
         
         return all_hotels
 
+    def _hotel_offers(self, hotel_ids: str) -> list:
+        """Offers for a comma-separated list of Amadeus hotel IDs."""
+        response = self.amadeus.shopping.hotel_offers_search.get(
+            hotelIds=hotel_ids,
+            adults=1,
+            currency='BRL'
+        )
+        return response.data or []
+
+    def _hotel_offers_or_none(self, hotel_id: str) -> Optional[list]:
+        """
+        Offers for one hotel. An ID rejected as invalid or without offers (see
+        NO_OFFER_STATUSES) has no offers; any other failure, including rate limits
+        and auth errors, returns None, as nothing is known about the hotel then.
+        """
+        try:
+            return self._hotel_offers(hotel_id)
+        except Exception as e:
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            return [] if status in NO_OFFER_STATUSES else None
+
+    @staticmethod
+    def _offer_to_hotel(city: str, offer: dict):
+        """Builds a Hotel from one hotel-offers entry, or None when it has no priced offer."""
+        try:
+            hotel_data = offer.get('hotel', {})
+            name = hotel_data.get('name', 'Unknown Hotel')
+
+            offers = offer.get('offers', [])
+            if not offers:
+                return None
+
+            price = float(offers[0]['price']['total'])
+
+            rating = hotel_data.get('rating')
+            if not rating: rating = 3.0
+            else:
+                try: rating = float(rating)
+                except: rating = 3.0
+
+            return Hotel(
+                city=city,
+                name=name,
+                price_per_night=price,
+                rating=rating
+            )
+        except Exception:
+            return None
+
     def fetch_car_rentals(self, cities: List[str], date: datetime = None) -> List[CarRental]:
         # TODO: Implement Amadeus Car Search
         return []
@@ -1,31 +1,105 @@
 import math
+from functools import lru_cache
 from typing import Optional, Tuple, List, Dict
 from datetime import datetime, timedelta
+import numpy as np
 from app.schemas.travel import Flight, CarRental
-from app.services.location_service import get_location_service
+from app.services.location_service import EARTH_RADIUS_KM, LocationService, get_location_service, unit_vectors
+
+# Try importing Numba, but fall back to plain Python if not installed
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable bare or with options."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 # The hardcoded tables are now managed centrally by LocationService
 
-def haversine_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
+# Ground segments are built from trusted, already-typed values, so skip
+# Pydantic validation (model_construct on v2, construct on v1)
+_build_flight = getattr(Flight, "model_construct", None) or Flight.construct
+
+# Below this many points the thread fan-out costs more than it saves
+PARALLEL_PAIRWISE_MIN_POINTS = 256
+
+# Neighbours fetched from the k-d tree; enough to step past the target's own airports
+NEAREST_CANDIDATES = 8
+
+# Fixed labels shared by every synthetic ground segment
+GROUND_AIRLINE = "🚗 Aluguel de Carro"
+GROUND_BAGGAGE = "Mala Grande"
+REAL_RATE_SUFFIX = " (Tarifa real encontrada)"
+
+# suggest_ground_transport messages; speed stored as its inverse (hours per km)
+_INV_AVG_SPEED_KMH = 1 / 80.0
+_DRIVE_SUGGESTION = "Car Rental suggested. Drive approx {h:.1f} hours ({d:.1f} km)."
+_NO_DRIVE_SUGGESTION = "Distance too far for driving recommendation. Check trains or buses."
+
+# Longest leg we still offer as a car rental
+MAX_DRIVE_KM = 600.0
+# Length of one degree of latitude; |dlat| * this never exceeds the true distance
+KM_PER_DEG_LAT = EARTH_RADIUS_KM * math.pi / 180.0
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate the great circle distance between two points
     on the earth (specified in decimal degrees)
     """
-    lat1, lon1 = coord1
-    lat2, lon2 = coord2
-
-    R = 6371  # Radius of earth in km
+    R = 6371.0  # Radius of earth in km
     dlat = math.radians(lat2 - lat1)
     dlon = math.radians(lon2 - lon1)
     a = math.sin(dlat / 2) * math.sin(dlat / 2) + \
         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * \
         math.sin(dlon / 2) * math.sin(dlon / 2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    c = 2 * math.asin(math.sqrt(min(1.0, a)))
     d = R * c
     return d
 
-def get_coords(city: str) -> Optional[Tuple[float, float]]:
-    service = get_location_service()
+@njit(parallel=True, fastmath=True, cache=True)
+def _pairwise_haversine_parallel(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Distance matrix (km) from radian arrays, rows spread across CPU cores."""
+    n = lat.shape[0]
+    cos_lat = np.cos(lat)
+    out = np.empty((n, n), dtype=lat.dtype)
+    for i in prange(n):
+        for j in range(n):
+            sdlat = math.sin((lat[i] - lat[j]) / 2)
+            sdlon = math.sin((lon[i] - lon[j]) / 2)
+            a = sdlat * sdlat + cos_lat[i] * cos_lat[j] * sdlon * sdlon
+            out[i, j] = 2 * 6371.0 * math.asin(math.sqrt(min(max(a, 0.0), 1.0)))
+    return out
+
+def haversine_pairs(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Element-wise Haversine distance (km) between arrays of points in decimal degrees."""
+    lat1, lon1, lat2, lon2 = np.radians(lat1), np.radians(lon1), np.radians(lat2), np.radians(lon2)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def pairwise_haversine(coords: np.ndarray) -> np.ndarray:
+    """
+    Great circle distance matrix (km) for an (N, 2) array of (lat, lon)
+    pairs in decimal degrees. Large inputs use the parallel Numba kernel
+    when available, everything else NumPy broadcasting.
+    """
+    if HAS_NUMBA and len(coords) >= PARALLEL_PAIRWISE_MIN_POINTS:
+        return _pairwise_haversine_parallel(np.radians(coords[:, 0]), np.radians(coords[:, 1]))
+
+    lat = np.radians(coords[:, 0])
+    lon = np.radians(coords[:, 1])
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def _get_coords_with(service: LocationService, city: str) -> Optional[Tuple[float, float]]:
+    """get_coords against an already-acquired LocationService handle."""
     # If input is already an IATA
     if len(city) == 3 and city.isalpha():
         return service.get_coords(city)
@@ -34,52 +108,101 @@ def get_coords(city: str) -> Optional[Tuple[float, float]]:
     iata = service.resolve_iata(city)
     return service.get_coords(iata)
 
+# The airport table is static for the life of the process, so lookups are
+# safe to memoize. Call get_coords.cache_clear() if it is ever reloaded.
+@lru_cache(maxsize=1024)
+def get_coords(city: str) -> Optional[Tuple[float, float]]:
+    return _get_coords_with(get_location_service(), city)
+
+def get_coords_bulk(cities: List[str]) -> np.ndarray:
+    """get_coords for many cities/IATAs at once, as a (k, 2) array with NaN rows for unknowns."""
+    service = get_location_service()
+    iatas = [c if len(c) == 3 and c.isalpha() else service.resolve_iata(c) for c in cities]
+    return service.get_coords_bulk(iatas)
+
+def _haversine_rank_score(lat1r: np.ndarray, coslat1: np.ndarray, lat2r: np.ndarray,
+                          coslat2: np.ndarray, dlon: np.ndarray) -> np.ndarray:
+    """
+    The Haversine 'a' term: sin²(dlat/2) + cos(lat1)·cos(lat2)·sin²(dlon/2).
+    Monotonic in great-circle distance, so it ranks without sqrt/asin.
+    Works on scalars and NumPy arrays alike.
+    """
+    sdlat = np.sin((lat2r - lat1r) / 2)
+    sdlon = np.sin(dlon / 2)
+    return sdlat * sdlat + coslat1 * coslat2 * sdlon * sdlon
+
+def _nearest_from_tree(tree, target_coords: Tuple[float, float], target_city: str,
+                       cities: np.ndarray, iatas: np.ndarray) -> Optional[Tuple[int, float]]:
+    """(index, km) of the closest airport not belonging to the target, via the k-d tree."""
+    point = unit_vectors(np.radians([target_coords[0]]), np.radians([target_coords[1]]))[0]
+    k = min(NEAREST_CANDIDATES, len(cities))
+    chords, idxs = tree.query(point, k=k)
+    for chord, idx in zip(np.atleast_1d(chords).tolist(), np.atleast_1d(idxs).tolist()):
+        if cities[idx] != target_city and iatas[idx] != target_city:
+            # Chord length on the unit sphere -> central angle -> km
+            return idx, 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+    return None
+
+def _nearest_from_scan(target_coords: Tuple[float, float], target_city: str, lats: np.ndarray, lons: np.ndarray,
+                       cos_lats: np.ndarray, cities: np.ndarray, iatas: np.ndarray) -> Optional[Tuple[int, float]]:
+    """(index, km) of the closest airport not belonging to the target, via a linear scan."""
+    t_lat, t_lon = np.radians(np.array(target_coords, dtype=np.float32))
+
+    # Rank on the Haversine 'a' term only; sqrt/asin run once, on the winner
+    scores = _haversine_rank_score(t_lat, np.cos(t_lat), lats, cos_lats, lons - t_lon)
+
+    # Never suggest the target itself
+    scores[(cities == target_city) | (iatas == target_city)] = np.inf
+
+    best = int(np.argmin(scores))
+    a_min = float(scores[best])
+    if not math.isfinite(a_min):
+        return None
+    return best, 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a_min)))
+
 def find_nearest_airport(target_city: str) -> Optional[Tuple[str, float]]:
     """
     Returns (Nearest City Name, Distance in KM)
     """
-    target_coords = get_coords(target_city)
+    service = get_location_service()
+    target_coords = _get_coords_with(service, target_city)
     if not target_coords:
         return None
 
-    service = get_location_service()
-    nearest_city = None
-    min_dist = float('inf')
-
-    # Iterate through all known airports in the service
-    for info in service.search_index:
-        if info.city == target_city or info.iata == target_city: 
-            continue
+    cities, iatas = service.cities, service.iatas
 
-        coords = (info.lat, info.lon)
-        dist = haversine_distance(target_coords, coords)
-        if dist < min_dist:
-            min_dist = dist
-            nearest_city = info.city
+    found = None
+    if service.kdtree is not None:
+        found = _nearest_from_tree(service.kdtree, target_coords, target_city, cities, iatas)
+    if found is None:
+        found = _nearest_from_scan(target_coords, target_city, service.lats_rad, service.lons_rad,
+                                   service.cos_lats, cities, iatas)
+    if found is None:
+        return None, float('inf')
 
-    return nearest_city, min_dist
+    best, dist = found
+    return str(cities[best]), dist
 
 def suggest_ground_transport(origin_city: str, dest_city: str, distance_km: float) -> str:
     if distance_km < 400:
-        hours = distance_km / 80.0
-        return f"Car Rental suggested. Drive approx {hours:.1f} hours ({distance_km:.1f} km)."
+        return _DRIVE_SUGGESTION.format(h=distance_km * _INV_AVG_SPEED_KMH, d=distance_km)
     else:
-        return "Distance too far for driving recommendation. Check trains or buses."
+        return _NO_DRIVE_SUGGESTION
 
 def generate_ground_segments(
     cities: List[str],
     start_date: datetime,
-    cars: List[CarRental] = None
+    cars: Optional[List[CarRental]] = None
 ) -> List[Flight]:
     """
     Generates synthetic 'Flight' objects representing ground transport between nearby cities.
     Uses real car rental data if available to estimate pricing.
     """
-    ground_segments = []
+    ground_segments: List[Flight] = []
 
     # Pre-process cars to map city -> cheapest daily rate and deep link
-    city_rental_rates = {}
-    city_rental_links = {}
+    city_rental_rates: Dict[str, float] = {}
+    city_rental_links: Dict[str, Optional[str]] = {}
     if cars:
         for car in cars:
             if car.city not in city_rental_rates:
@@ -95,52 +218,90 @@ def generate_ground_segments(
     GAS_PRICE_PER_KM = 0.8
     AVG_SPEED_KMH = 80.0
 
-    for i in range(len(cities)):
-        for j in range(len(cities)):
-            if i == j: continue
-
-            city_a = cities[i]
-            city_b = cities[j]
-
-            coords_a = get_coords(city_a)
-            coords_b = get_coords(city_b)
-
-            if coords_a and coords_b:
-                dist = haversine_distance(coords_a, coords_b)
-
-                # Check if feasibly drivable (e.g., < 600km)
-                if dist < 600:
-                    duration_hours = dist / AVG_SPEED_KMH
-                    duration_minutes = int(duration_hours * 60)
-                    days_needed = max(1, duration_hours / 12.0) # Assume max 12h driving per day? Or just rental days.
-
-                    # Determine Daily Rate
-                    rate = city_rental_rates.get(city_a, DEFAULT_DAILY_RATE)
-
-                    # Total Price = (Rate * Days) + (Gas * Distance)
-                    total_car_cost = (rate * days_needed) + (GAS_PRICE_PER_KM * dist)
-
-                    # Assume effective per-person price for 2 people to be competitive
-                    price_per_person = total_car_cost / 2.0
-
-                    details_str = f"Distância: {dist:.1f}km. Carro: {city_a} -> {city_b}"
-                    if city_a in city_rental_rates:
-                         details_str += " (Tarifa real encontrada)"
-
-                    # Create Segment
-                    seg = Flight(
-                        origin=city_a,
-                        destination=city_b,
-                        price=round(price_per_person, 2),
-                        duration_minutes=duration_minutes,
-                        airline="🚗 Aluguel de Carro",
-                        departure_time=start_date + timedelta(hours=8),
-                        arrival_time=start_date + timedelta(hours=8, minutes=duration_minutes),
-                        stops=0,
-                        baggage="Mala Grande",
-                        details=details_str,
-                        deep_link=city_rental_links.get(city_a)
-                    )
-                    ground_segments.append(seg)
+    # Every ground segment departs at 08:00 on the start date
+    base_dep = start_date + timedelta(hours=8)
+    # Arrival datetimes keyed by drive minutes; A->B and B->A share one object
+    arrivals: Dict[int, datetime] = {}
+
+    # Resolve coordinates once, then measure candidate pairs in one batch
+    service = get_location_service()
+    located: List[str] = []
+    coords: List[Tuple[float, float]] = []
+    for city in cities:
+        c = _get_coords_with(service, city)
+        if c:
+            located.append(city)
+            coords.append(c)
+    if len(located) < 2:
+        return ground_segments
+
+    coord_arr = np.asarray(coords, dtype=np.float64)
+    lat, lon = coord_arr[:, 0], coord_arr[:, 1]
+
+    # Latitude bounding box: pairs further apart north-south than the driving
+    # limit can't be drivable, so they never reach the trig below
+    near = np.abs(lat[:, None] - lat[None, :]) < MAX_DRIVE_KM / KM_PER_DEG_LAT
+
+    # Distance is symmetric: measure each unordered pair (i < j) once, then
+    # mirror it for the reverse direction, keeping the row-major pair order
+    iu, ju = np.nonzero(np.triu(near, k=1))
+    upper_dists = haversine_pairs(lat[iu], lon[iu], lat[ju], lon[ju])
+    ii = np.concatenate((iu, ju))
+    jj = np.concatenate((ju, iu))
+    pair_dists = np.concatenate((upper_dists, upper_dists))
+    order = np.argsort(ii * len(located) + jj, kind="stable")
+    ii, jj, pair_dists = ii[order], jj[order], pair_dists[order]
+
+    # Per-origin rental data, looked up once per city instead of once per pair
+    rates_get = city_rental_rates.get
+    links_get = city_rental_links.get
+    rate_per_origin: List[float] = [rates_get(c, DEFAULT_DAILY_RATE) for c in located]
+    details_suffix: List[str] = [REAL_RATE_SUFFIX if c in city_rental_rates else "" for c in located]
+    link_per_origin: List[Optional[str]] = [links_get(c) for c in located]
+
+    # Only feasibly drivable pairs (e.g., < 600km) become segments.
+    # Pull indices and distances out as plain Python lists so the loop below
+    # never touches NumPy scalars.
+    drivable = pair_dists < MAX_DRIVE_KM
+    ii, jj, pair_dists = ii[drivable], jj[drivable], pair_dists[drivable]
+
+    for i, j, dist in zip(ii.tolist(), jj.tolist(), pair_dists.tolist()):
+        city_a = located[i]
+        city_b = located[j]
+
+        duration_hours = dist / AVG_SPEED_KMH
+        duration_minutes = int(duration_hours * 60)
+        days_needed = max(1, duration_hours / 12.0) # Assume max 12h driving per day? Or just rental days.
+
+        arrival_time = arrivals.get(duration_minutes)
+        if arrival_time is None:
+            arrival_time = arrivals[duration_minutes] = base_dep + timedelta(minutes=duration_minutes)
+
+        # Determine Daily Rate
+        rate = rate_per_origin[i]
+
+        # Total Price = (Rate * Days) + (Gas * Distance)
+        total_car_cost = (rate * days_needed) + (GAS_PRICE_PER_KM * dist)
+
+        # Assume effective per-person price for 2 people to be competitive
+        price_per_person = total_car_cost / 2.0
+
+        details_str = f"Distância: {dist:.1f}km. Carro: {city_a} -> {city_b}{details_suffix[i]}"
+
+        # Create Segment (validation-free; every field is computed above)
+        seg = _build_flight(
+            origin=city_a,
+            destination=city_b,
+            price=round(price_per_person, 2),
+            duration_minutes=duration_minutes,
+            airline=GROUND_AIRLINE,
+            departure_time=base_dep,
+            arrival_time=arrival_time,
+            stops=0,
+            baggage=GROUND_BAGGAGE,
+            details=details_str,
+            deep_link=link_per_origin[i]
+        )
+        ground_segments.append(seg)
 
     return ground_segments
@@ -1,11 +1,61 @@
+import json
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
 from typing import List, Dict
 from app.schemas.travel import Flight, Hotel, CarRental, TravelRequest, SolverResult
-from app.services.geo_service import get_coords
+from app.services.geo_service import get_coords_bulk
+
+# Try importing FastAPI's encoder; fall back to .dict() serialization if not installed
+try:
+    from fastapi.encoders import jsonable_encoder
+    HAS_FASTAPI = True
+except ImportError:
+    HAS_FASTAPI = False
 
 
 SOLVER_SERVICE_URL = "http://localhost:8002/api/v1/solve"
 
+# One pooled session for all solver calls, so keep-alive skips the TCP handshake
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
+@lru_cache(maxsize=256)
+def _cached_post(payload_json: str) -> str:
+    """
+    Posts a canonical JSON payload to the solver and returns the raw response body.
+    Identical requests (e.g. re-running the same search from the UI) are answered
+    from memory; failed calls raise and are therefore never cached.
+    """
+    resp = _session.post(SOLVER_SERVICE_URL, data=payload_json.encode("utf-8"),
+                         headers={"Content-Type": "application/json"}, timeout=30)
+    resp.raise_for_status()
+    return resp.text
+
+
+def _attach_leg_coords(result: SolverResult) -> None:
+    """
+    Fills origin_coords/dest_coords on each leg for the map view.
+    Coordinates are gathered once per city into an (n, 2) array and indexed per leg.
+    """
+    cities = list(dict.fromkeys(c for leg in result.itinerary for c in (leg.origin, leg.destination)))
+    if not cities:
+        return
+    city_idx = {city: i for i, city in enumerate(cities)}
+    coords_arr = get_coords_bulk(cities)
+    known = ~np.isnan(coords_arr[:, 0])
+    coords_list = coords_arr.tolist()
+
+    for leg in result.itinerary:
+        i, j = city_idx[leg.origin], city_idx[leg.destination]
+        if leg.origin_coords is None and known[i]:
+            leg.origin_coords = coords_list[i]
+        if leg.dest_coords is None and known[j]:
+            leg.dest_coords = coords_list[j]
+
 
 def solve_itinerary(
     request: TravelRequest,
@@ -17,7 +67,8 @@ def solve_itinerary(
     try:
         # Serialize datetimes and Pydantic models to JSON-friendly types
         try:
-            from fastapi.encoders import jsonable_encoder
+            if not HAS_FASTAPI:
+                raise ImportError("fastapi is not installed")
             payload = jsonable_encoder({
                 "travel_request": request,
                 "flights": flights,
@@ -33,14 +84,14 @@ def solve_itinerary(
                 "cars": [c.dict() for c in cars]
             }
 
-        resp = requests.post(SOLVER_SERVICE_URL, json=payload, timeout=30)
-        resp.raise_for_status()
-
-        data = resp.json()
+        # sort_keys gives equal requests the same cache key regardless of field order
+        payload_json = json.dumps(payload, sort_keys=True, default=str)
+        data = json.loads(_cached_post(payload_json))
 
         # Convert response to SolverResult
         # Pydantic models accept dicts so we can reuse SolverResult
         result = SolverResult(**data)
+        _attach_leg_coords(result)
         return result
 
     except Exception as e:
@@ -1,10 +1,17 @@
-import random
+import re
+import threading
+import unicodedata
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator
 import pandas as pd
 import numpy as np
 from data.models import Flight, Hotel, CarRental
+from data.database import FlightCache, derive_ttl_seconds
+import requests
+from requests.adapters import HTTPAdapter
 
 # Try importing Selenium, but don't fail if not installed yet (for initial setup)
 try:
@@ -19,6 +26,127 @@ try:
 except ImportError:
     HAS_SELENIUM = False
 
+# selectolax's lexbor parser is far faster than BeautifulSoup on the large result
+# pages; fall back to BeautifulSoup when it is not installed
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
+    HAS_BS4 = True
+except ImportError:
+    HAS_BS4 = False
+
+# BeautifulSoup's lxml tree builder runs in C; 'html.parser' is pure Python
+try:
+    import lxml  # noqa: F401
+    _BS4_PARSER = 'lxml'
+except ImportError:
+    _BS4_PARSER = 'html.parser'
+
+# Patterns used while parsing result cards, compiled once instead of per card
+# Common class for flight cards in recent versions
+_CARD_CLASS_RE = re.compile(r'pIav2d')
+# Either kind of card as one CSS selector, for the explicit page-load wait
+_CARD_SELECTOR = 'li[class*="pIav2d"], div[role="listitem"]'
+# R$ followed by digits, dots and maybe comma + cents (BRL 1.234,56 format)
+_PRICE_RE = re.compile(r'R\$\s?([\d\.]+),?(\d{2})?')
+# "2h 15m", "3h"
+_DURATION_RE = re.compile(r'(\d+)h\s?(\d+)?m?')
+# Known airlines, in priority order when a card mentions several
+KNOWN_AIRLINES = ["Latam", "Gol", "Azul", "Voepass", "American", "United", "Delta", "Air France"]
+# One scan of the card text for any of them
+_AIRLINES_RE = re.compile('|'.join(map(re.escape, KNOWN_AIRLINES)))
+
+def _first_known_airline(text: str) -> str:
+    """The highest-priority known airline mentioned in text, or "Unknown"."""
+    found = set(_AIRLINES_RE.findall(text))
+    return next((name for name in KNOWN_AIRLINES if name in found), "Unknown")
+
+def iter_flight_card_texts(page_source: str) -> Iterator[str]:
+    """
+    Yields the text of each flight result card on a Google Flights page, with
+    the card's text nodes joined by " | ".
+    Cards are the 'pIav2d' list items, or any role="listitem" element when the
+    page has none of those.
+    """
+    if HAS_SELECTOLAX:
+        tree = LexborHTMLParser(page_source)
+        cards = tree.css('li[class*="pIav2d"]') or tree.css('div[role="listitem"]')
+        for card in cards:
+            yield card.text(separator=" | ")
+        return
+
+    if not HAS_BS4:
+        raise ImportError("Neither selectolax nor BeautifulSoup is installed.")
+
+    # SoupStrainer keeps only the candidate cards while feeding, so the scripts,
+    # styles and page chrome around them never become tree nodes
+    soup = BeautifulSoup(page_source, _BS4_PARSER, parse_only=SoupStrainer('li', attrs={'class': _CARD_CLASS_RE}))
+    flight_cards = soup.find_all('li', class_=_CARD_CLASS_RE)
+    if not flight_cards:
+        # Try finding by ARIA label or generic structure
+        soup = BeautifulSoup(page_source, _BS4_PARSER, parse_only=SoupStrainer('div', attrs={'role': 'listitem'}))
+        flight_cards = soup.select('div[role="listitem"]') # Broad fallback logic
+    for card in flight_cards:
+        yield card.get_text(separator=" | ")
+
+def _fold_city_name(name: str) -> str:
+    """Case- and accent-insensitive key for a city name ('São Paulo' -> 'sao paulo')."""
+    return ''.join(c for c in unicodedata.normalize('NFKD', name) if not unicodedata.combining(c)).casefold()
+
+# Simple Mock IATA Mapper (instead of Amadeus City Search) for AmadeusCrawler
+# For prototype, we map common Brazilian cities. Keys are folded once here, so
+# one entry covers every spelling with or without accents.
+_CITY_IATA = {
+    _fold_city_name(city): iata for city, iata in {
+        "São Paulo": "GRU",
+        "Rio de Janeiro": "GIG",
+        "Belo Horizonte": "CNF",
+        "Brasília": "BSB",
+        "Salvador": "SSA",
+        "Curitiba": "CWB",
+        "Florianópolis": "FLN",
+        "Miami": "MIA",
+        "Orlando": "MCO",
+        "New York": "JFK",
+        "Paris": "CDG",
+        "London": "LHR",
+        "Uberlândia": "UDI",
+        "Ituiutaba": "UDI",
+        "Goiânia": "GYN",
+        "Aparecida de Goiânia": "GYN", # Fallback IATA for flight search if passed directly
+    }.items()
+}
+
+def iso_duration_minutes(value: str) -> int:
+    """
+    Whole minutes in an ISO 8601 duration of days and time, such as 'PT2H45M'
+    or 'P1DT3H10M' (the forms Amadeus uses for itinerary durations).
+    A single scan over the characters, instead of a regex match and a timedelta per offer.
+    """
+    units = {'D': 86400, 'H': 3600, 'M': 60, 'S': 1}
+    if not value.startswith('P'):
+        raise ValueError(f"Not an ISO 8601 duration: {value!r}")
+    seconds = 0
+    number = 0
+    in_time = False
+    for c in value[1:]:
+        if '0' <= c <= '9':
+            number = number * 10 + (ord(c) - 48)
+        elif c == 'T':
+            in_time = True
+        elif (c == 'D' and not in_time) or (c in 'HMS' and in_time):
+            seconds += number * units[c]
+            number = 0
+        else:
+            # Years/months/weeks, fractions or anything else Amadeus does not send
+            raise ValueError(f"Unsupported ISO 8601 duration: {value!r}")
+    return seconds // 60
+
 class BaseCrawler(ABC):
     @abstractmethod
     @abstractmethod
@@ -33,64 +161,117 @@ class BaseCrawler(ABC):
     def fetch_car_rentals(self, cities: List[str]) -> List[CarRental]:
         pass
 
+    def close(self):
+        """Releases any long-lived resources (browser sessions). No-op by default."""
+        pass
+
 class MockCrawler(BaseCrawler):
+    AIRLINES = np.array(["Latam", "Gol", "Azul", "Voepass"])
+    FLIGHT_PREFIXES = np.array(['G3', 'LA', 'AD', '2Z'])
+    HOTEL_NAMES = np.array(['Plaza', 'Royal', 'Suites', 'Inn', 'Grand'])
+    CAR_COMPANIES = np.array(["Localiza", "Movida", "Unidas"])
+    CAR_MODELS = np.array(["Gol", "Onix", "Compass", "Renegade"])
+
+    def __init__(self, seed=None):
+        # Every field is drawn as one NumPy vector covering all routes (or cities)
+        # and only zipped into objects at the end; a seed makes the data repeatable
+        self.rng = np.random.default_rng(seed)
+
     def fetch_flights(self, origin: str, destinations: List[str], date: datetime, adults: int = 1, children: int = 0) -> List[Flight]:
-        flights = []
-        for dest in destinations:
-            if origin == dest:
-                continue
-            
-            # Generate 3-5 flight options per route
-            for _ in range(random.randint(3, 5)):
-                price = random.uniform(200, 1500)
-                duration = random.randint(45, 300) # minutes
-                airline = random.choice(["Latam", "Gol", "Azul", "Voepass"])
-                
-                # Randomize dep time
-                hour = random.randint(6, 22)
-                minute = random.choice([0, 15, 30, 45])
-                dep_time = date.replace(hour=hour, minute=minute)
-                arr_time = dep_time + timedelta(minutes=duration)
+        routes = [dest for dest in destinations if dest != origin]
+        if not routes:
+            return []
+        rng = self.rng
 
-                flight_no = f"{random.choice(['G3', 'LA', 'AD', '2Z'])}{random.randint(1000, 9999)}"
+        # Generate 3-5 flight options per route
+        counts = rng.integers(3, 6, len(routes))
+        n = int(counts.sum())
+        dests = np.repeat(routes, counts).tolist()
+        prices = np.round(rng.uniform(200, 1500, n), 2).tolist()
+        durations = rng.integers(45, 301, n).tolist() # minutes
+        airlines = rng.choice(self.AIRLINES, n).tolist()
+        # Randomize dep time
+        hours = rng.integers(6, 23, n).tolist()
+        minutes = rng.choice([0, 15, 30, 45], n).tolist()
+        prefixes = rng.choice(self.FLIGHT_PREFIXES, n).tolist()
+        numbers = rng.integers(1000, 10000, n).tolist()
 
-                flights.append(Flight(
-                    origin=origin,
-                    destination=dest,
-                    price=round(price, 2),
-                    duration_minutes=duration,
-                    airline=airline,
-                    departure_time=dep_time,
-                    arrival_time=arr_time,
-                    flight_number=flight_no
-                ))
+        flights = []
+        for dest, price, duration, airline, hour, minute, prefix, number in zip(
+            dests, prices, durations, airlines, hours, minutes, prefixes, numbers
+        ):
+            dep_time = date.replace(hour=hour, minute=minute)
+            flights.append(Flight(
+                origin=origin,
+                destination=dest,
+                price=price,
+                duration_minutes=duration,
+                airline=airline,
+                departure_time=dep_time,
+                arrival_time=dep_time + timedelta(minutes=duration),
+                flight_number=f"{prefix}{number}"
+            ))
         return flights
 
     def fetch_hotels(self, cities: List[str]) -> List[Hotel]:
-        hotels = []
-        for city in cities:
-            for i in range(random.randint(3, 6)):
-                name = f"Hotel {random.choice(['Plaza', 'Royal', 'Suites', 'Inn', 'Grand'])} {city}"
-                price = random.uniform(150, 800)
-                rating = round(random.uniform(3.0, 5.0), 1)
-                hotels.append(Hotel(city=city, name=name, price_per_night=round(price, 2), rating=rating))
-        return hotels
+        if not cities:
+            return []
+        rng = self.rng
+        counts = rng.integers(3, 7, len(cities))
+        n = int(counts.sum())
+        hotel_cities = np.repeat(cities, counts).tolist()
+        names = rng.choice(self.HOTEL_NAMES, n).tolist()
+        prices = np.round(rng.uniform(150, 800, n), 2).tolist()
+        ratings = np.round(rng.uniform(3.0, 5.0, n), 1).tolist()
+        return [
+            Hotel(city=city, name=f"Hotel {name} {city}", price_per_night=price, rating=rating)
+            for city, name, price, rating in zip(hotel_cities, names, prices, ratings)
+        ]
 
     def fetch_car_rentals(self, cities: List[str]) -> List[CarRental]:
-        cars = []
-        for city in cities:
-            for _ in range(random.randint(2, 4)):
-                company = random.choice(["Localiza", "Movida", "Unidas"])
-                model = random.choice(["Gol", "Onix", "Compass", "Renegade"])
-                price = random.uniform(80, 250)
-                cars.append(CarRental(city=city, company=company, price_per_day=round(price, 2), model=model))
-        return cars
+        if not cities:
+            return []
+        rng = self.rng
+        counts = rng.integers(2, 5, len(cities))
+        n = int(counts.sum())
+        car_cities = np.repeat(cities, counts).tolist()
+        companies = rng.choice(self.CAR_COMPANIES, n).tolist()
+        models = rng.choice(self.CAR_MODELS, n).tolist()
+        prices = np.round(rng.uniform(80, 250, n), 2).tolist()
+        return [
+            CarRental(city=city, company=company, price_per_day=price, model=model)
+            for city, company, model, price in zip(car_cities, companies, models, prices)
+        ]
+
+# Concurrent Amadeus flight searches (cache misses) per fetch_flights call
+AMADEUS_WORKERS = 8
+
+# Routes crawled concurrently by GoogleFlightsCrawler (one Chrome session each)
+CRAWL_WORKERS = 4
+
+def _quit_drivers(drivers):
+    for driver in drivers:
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Crawler Error on quit: {e}")
+    drivers.clear()
 
 class GoogleFlightsCrawler(BaseCrawler):
+    # chromedriver path, resolved by ChromeDriverManager once per process
+    _driver_path = None
+
     def __init__(self, headless=True):
         if not HAS_SELENIUM:
             raise ImportError("Selenium not installed.")
         
+        # Chrome sessions are started on demand, up to CRAWL_WORKERS, and kept
+        # across fetch_flights calls; see close()
+        self._idle_drivers = []
+        self._lock = threading.Lock()
+        # Callers that never reach close() must not leave Chrome processes behind.
+        # The finalizer holds only the idle list, so the crawler can still be collected
+        self._finalizer = weakref.finalize(self, _quit_drivers, self._idle_drivers)
         self.options = Options()
         if headless:
             self.options.add_argument("--headless")
@@ -101,122 +282,158 @@ class GoogleFlightsCrawler(BaseCrawler):
         self.options.add_argument("--disable-blink-features=AutomationControlled")
         self.options.add_experimental_option("excludeSwitches", ["enable-automation"])
         self.options.add_experimental_option("useAutomationExtension", False)
+        # Only the result text is scraped: skip images, fonts and stylesheets so
+        # pages load faster and the DOM handed to the parser stays small
+        self.options.add_argument("--blink-settings=imagesEnabled=false")
+        self.options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+        # No background work unrelated to the page being crawled
+        for arg in ("--disable-extensions", "--disable-background-networking", "--disable-sync", "--mute-audio"):
+            self.options.add_argument(arg)
+        # driver.get returns once the DOM is parsed; the explicit wait for the
+        # result cards in _fetch_route covers the rest of the rendering
+        self.options.page_load_strategy = 'eager'
         self.options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36")
 
-    def _get_driver(self):
-        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=self.options)
+    def _acquire_driver(self):
+        """An idle Chrome session from the pool, or a new one."""
+        with self._lock:
+            if self._idle_drivers:
+                return self._idle_drivers.pop()
+            if GoogleFlightsCrawler._driver_path is None:
+                GoogleFlightsCrawler._driver_path = ChromeDriverManager().install()
+        driver = webdriver.Chrome(service=Service(GoogleFlightsCrawler._driver_path), options=self.options)
+        # Only explicit waits are used; an implicit wait would stack onto every one of them
+        driver.implicitly_wait(0)
+        return driver
+
+    def _release_driver(self, driver):
+        with self._lock:
+            self._idle_drivers.append(driver)
+
+    def close(self):
+        """Quits every pooled Chrome session."""
+        with self._lock:
+            drivers = list(self._idle_drivers)
+            self._idle_drivers.clear()
+        _quit_drivers(drivers)
 
     def fetch_flights(self, origin: str, destinations: List[str], date: datetime, adults: int = 1, children: int = 0) -> List[Flight]:
+        routes = [dest for dest in destinations if dest != origin]
+        if not routes:
+            return []
+
+        # Each destination is a separate page load dominated by network and JS
+        # rendering, so routes are crawled concurrently, one browser per worker.
+        # map() keeps the results in destination order.
+        workers = min(CRAWL_WORKERS, len(routes))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            per_route = list(pool.map(lambda dest: self._crawl_route(origin, dest, date), routes))
+        return [flight for flights in per_route for flight in flights]
+
+    def _crawl_route(self, origin: str, dest: str, date: datetime) -> List[Flight]:
+        try:
+            driver = self._acquire_driver()
+        except Exception as e:
+            print(f"Crawler Error: {e}")
+            return []
+        try:
+            flights = self._fetch_route(driver, origin, dest, date)
+        except Exception as e:
+            print(f"Crawler Error: {e}")
+            # The session may be dead; drop it so a fresh browser is started next time
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return []
+        self._release_driver(driver)
+        return flights
+
+    def _fetch_route(self, driver, origin: str, dest: str, date: datetime) -> List[Flight]:
         flights = []
-        driver = None
+        # Construct URL using query mechanism which is more robust than direct URL hacking
+        # Format: "Flights from [Origin] to [Dest] on [Date]"
+        date_str = date.strftime("%Y-%m-%d")
+        query = f"Flights from {origin} to {dest} on {date_str}"
+        encoded_query = query.replace(" ", "+")
+        url = f"https://www.google.com/travel/flights?q={encoded_query}"
+        
+        print(f"Crawling: {url}")
+        driver.get(url)
+        
+        # Wait for results to load (Look for specific flights UI elements)
+        # Google Flights usually puts listed flights in a role="listitem" or specific class
         try:
-            driver = self._get_driver()
+            # Wait for at least one flight card. Increased timeout to 30s as requested.
+            # A CSS selector on the card elements is matched natively by the browser,
+            # unlike the XPath text() search over every div it replaces
+            WebDriverWait(driver, 30, poll_frequency=0.25).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, _CARD_SELECTOR))
+            )
+        except Exception:
+            print(f"Timeout waiting for results for {origin}->{dest} (30s). Attempting to parse whatever is visible...")
+            # Do not continue; proceed to parse what we have
+
+        # Parse content
+        # Heuristic parsing for Google Flights standard result cards
+        # Best effort to find the flight list items. usually a role='main' then lists.
+        # We search for elements that contain price and duration.
+        # Classes change often, so cards are matched loosely (see iter_flight_card_texts)
+
+        count = 0 
+        for text_content in iter_flight_card_texts(driver.page_source):
+            if count >= 5: break # Limit to top 5 flights per route for speed
             
-            for dest in destinations:
-                if origin == dest:
-                    continue
+            try:
+                # Extract Price (Handle BRL 1.234,56 format)
+                # Look for R$ followed by digits, dots and maybe comma
+                price_match = _PRICE_RE.search(text_content)
+                if not price_match: continue
                 
-                # Construct URL using query mechanism which is more robust than direct URL hacking
-                # Format: "Flights from [Origin] to [Dest] on [Date]"
-                date_str = date.strftime("%Y-%m-%d")
-                query = f"Flights from {origin} to {dest} on {date_str}"
-                encoded_query = query.replace(" ", "+")
-                url = f"https://www.google.com/travel/flights?q={encoded_query}"
+                # raw: 1.234 or 1234
+                raw_int = price_match.group(1).replace('.', '')
+                cents = price_match.group(2) if price_match.group(2) else "00"
+                price = float(f"{raw_int}.{cents}")
                 
-                print(f"Crawling: {url}")
-                driver.get(url)
+                # Extract Duration
+                dur_match = _DURATION_RE.search(text_content)
+                minutes = 0
+                if dur_match:
+                    h = int(dur_match.group(1))
+                    m = int(dur_match.group(2)) if dur_match.group(2) else 0
+                    minutes = h * 60 + m
+                else:
+                    minutes = 120 # Default fallback
+                    
+                # Extract Airline (Heuristic: First few words usually, or look for specific known airlines)
+                airline = _first_known_airline(text_content)
                 
-                # Wait for results to load (Look for specific flights UI elements)
-                # Google Flights usually puts listed flights in a role="listitem" or specific class
-                try:
-                    # Wait for at least one price element or flight card. Increased timeout to 30s as requested.
-                    WebDriverWait(driver, 30).until(
-                        EC.presence_of_element_located((By.XPATH, "//div[contains(text(), 'R$')] | //div[@role='listitem']"))
-                    )
-                except Exception:
-                    print(f"Timeout waiting for results for {origin}->{dest} (30s). Attempting to parse whatever is visible...")
-                    # Do not continue; proceed to parse what we have
+                # Times
+                # Simple heuristics for now
+                dep_time = date.replace(hour=8, minute=0) # Mock time if parsing fails
+                arr_time = dep_time + timedelta(minutes=minutes)
 
-                # Parse content
-                from bs4 import BeautifulSoup
-                import re
-                
-                soup = BeautifulSoup(driver.page_source, 'html.parser')
-                
-                # Heuristic parsing for Google Flights standard result cards
-                # Best effort to find the flight list items. usually a role='main' then lists.
-                # We search for elements that contain price and duration.
-                
-                # Find all list items that might be flights
-                # This is tricky as classes change. We look for 'li' elements in the main area.
-                flight_cards = soup.find_all('li', class_=re.compile(r'pIav2d')) # Common class for flight cards in recent versions
+                flights.append(Flight(
+                    origin=origin,
+                    destination=dest,
+                    price=price,
+                    duration_minutes=minutes,
+                    airline=airline,
+                    departure_time=dep_time,
+                    arrival_time=arr_time
+                ))
+                print(f"[CRAWLER] Found: {airline} | {origin}->{dest} | R$ {price:.2f} | {minutes}min")
+                count += 1
                 
-                # Fallback if specific class not found
-                if not flight_cards:
-                    # Try finding by ARIA label or generic structure
-                     flight_cards = soup.select('div[role="listitem"]') # Broad fallback logic
-
-                count = 0 
-                for card in flight_cards:
-                    if count > 5: break # Limit to top 5 flights per route for speed
-                    
-                    try:
-                        text_content = card.get_text(separator=" | ")
-                        
-                        # Extract Price (Handle BRL 1.234,56 format)
-                        # Look for R$ followed by digits, dots and maybe comma
-                        price_match = re.search(r'R\$\s?([\d\.]+),?(\d{2})?', text_content)
-                        if not price_match: continue
-                        
-                        # raw: 1.234 or 1234
-                        raw_int = price_match.group(1).replace('.', '')
-                        cents = price_match.group(2) if price_match.group(2) else "00"
-                        price = float(f"{raw_int}.{cents}")
-                        
-                        # Extract Duration
-                        dur_match = re.search(r'(\d+)h\s?(\d+)?m?', text_content)
-                        minutes = 0
-                        if dur_match:
-                            h = int(dur_match.group(1))
-                            m = int(dur_match.group(2)) if dur_match.group(2) else 0
-                            minutes = h * 60 + m
-                        else:
-                            minutes = 120 # Default fallback
-                            
-                        # Extract Airline (Heuristic: First few words usually, or look for specific known airlines)
-                        airline = "Unknown"
-                        for company in ["Latam", "Gol", "Azul", "Voepass", "American", "United", "Delta", "Air France"]:
-                            if company in text_content:
-                                airline = company
-                                break
-                        
-                        # Times
-                        # Simple heuristics for now
-                        dep_time = date.replace(hour=8, minute=0) # Mock time if parsing fails
-                        arr_time = dep_time + timedelta(minutes=minutes)
+            except Exception as e:
+                print(f"Error parsing card: {e}")
+                continue
 
-                        flights.append(Flight(
-                            origin=origin,
-                            destination=dest,
-                            price=price,
-                            duration_minutes=minutes,
-                            airline=airline,
-                            departure_time=dep_time,
-                            arrival_time=arr_time
-                        ))
-                        print(f"[CRAWLER] Found: {airline} | {origin}->{dest} | R$ {price:.2f} | {minutes}min")
-                        count += 1
-                        
-                    except Exception as e:
-                        print(f"Error parsing card: {e}")
-                        continue
-                        
-        except Exception as e:
-            print(f"Crawler Error: {e}")
-        finally:
-            if driver:
-                driver.quit()
-                
         return flights
 
     def fetch_hotels(self, cities: List[str]) -> List[Hotel]:
@@ -226,10 +443,17 @@ class GoogleFlightsCrawler(BaseCrawler):
         return []
 
 class AmadeusCrawler(BaseCrawler):
+    # One pooled session for the manual auth calls of every crawler instance, so
+    # keep-alive skips the TCP/TLS handshake after the first one
+    _session = requests.Session()
+    _session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
     def __init__(self, client_id: str, client_secret: str, production: bool = False):
         self.production = production
         self.client_id = client_id
         self.client_secret = client_secret
+        # One response cache per crawler, shared by every route and city lookup
+        self._cache = FlightCache()
         
         # Verify Auth Manually (as requested to follow Manual)
         self.validate_auth()
@@ -260,8 +484,6 @@ class AmadeusCrawler(BaseCrawler):
 
     def validate_auth(self):
         """Manual implementation of Auth flow for debugging"""
-        import requests
-        
         base_url = "https://api.amadeus.com" if self.production else "https://test.api.amadeus.com"
         token_url = f"{base_url}/v1/security/oauth2/token"
         
@@ -269,7 +491,7 @@ class AmadeusCrawler(BaseCrawler):
         print(f"Target URL: {token_url}")
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 token_url,
                 data={
                     "grant_type": "client_credentials",
@@ -294,47 +516,43 @@ class AmadeusCrawler(BaseCrawler):
             print("Amadeus client not ready.")
             return []
             
+        routes = [dest for dest in destinations if dest != origin]
         flights = []
-        for dest in destinations:
-            if origin == dest: continue
-            
+        date_str = date.strftime("%Y-%m-%d")
+        cache_date_key = f"{date_str}_A{adults}_C{children}" # Update cache key
+        # Check Cache First: one query covers every destination. An unreadable
+        # cache just means every route is fetched from the API
+        try:
+            cached = self._cache.get_cached_responses(origin, routes, cache_date_key, "AMADEUS")
+        except Exception as e:
+            print(f"Cache Read Error: {e}")
+            cached = {}
+
+        # Each cache miss is a separate HTTPS round trip that spends its time
+        # waiting on Amadeus, so misses are searched concurrently
+        missing = [dest for dest in routes if not cached.get(dest)]
+        fetched = {}
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(AMADEUS_WORKERS, len(missing))) as pool:
+                results = pool.map(lambda dest: self._search_flight_offers(origin, dest, date_str, adults, children), missing)
+                fetched = dict(zip(missing, results))
+        # Save to Cache, in one transaction; fares nearer departure expire sooner.
+        # A failed write must not cost the flights already fetched
+        try:
+            self._cache.save_responses(
+                [(origin, dest, cache_date_key, data) for dest, data in fetched.items() if data], "AMADEUS",
+                ttl_seconds=derive_ttl_seconds(date)
+            )
+        except Exception as e:
+            print(f"Cache Save Error: {e}")
+
+        for dest in routes:
             try:
-                date_str = date.strftime("%Y-%m-%d")
-                cache_date_key = f"{date_str}_A{adults}_C{children}" # Update cache key
-                
-                # Check Cache First
-                from data.database import FlightCache
-                cache = FlightCache()
-                cached_data = cache.get_cached_response(origin, dest, cache_date_key, "AMADEUS")
-                
-                response_data = None
-                
-                if cached_data:
+                response_data = cached.get(dest)
+                if response_data:
                     print(f"[CACHE HIT] Using cached data for Amadeus {origin}->{dest}")
-                    response_data = cached_data
                 else:
-                    # API Call
-                    # Amadeus API supports 'children' and 'infants'
-                    # We map our 'children' input to API 'children' (2-11yo)
-                    # If we wanted to support infants, we would need another param.
-                    
-                    req_params = {
-                        "originLocationCode": self._get_iata(origin),
-                        "destinationLocationCode": self._get_iata(dest),
-                        "departureDate": date_str,
-                        "adults": adults,
-                        "max": 25,
-                        "currencyCode": 'BRL'
-                    }
-                    if children > 0:
-                        req_params["children"] = children
-                        
-                    response = self.amadeus.shopping.flight_offers_search.get(**req_params)
-
-                    if response.data:
-                        response_data = response.data
-                        # Save to Cache
-                        cache.save_response(origin, dest, cache_date_key, response_data, "AMADEUS")
+                    response_data = fetched.get(dest)
                 
                 if response_data:
                     for offer in response_data:
@@ -347,9 +565,7 @@ class AmadeusCrawler(BaseCrawler):
                         currency = offer['price']['currency']
                         
                         # Duration (ISO 8601 PT1H30M)
-                        import isodate
-                        duration = isodate.parse_duration(itineraries['duration'])
-                        minutes = int(duration.total_seconds() / 60)
+                        minutes = iso_duration_minutes(itineraries['duration'])
                         
                         # Airline
                         carrier_code = segment['carrierCode']
@@ -403,13 +619,36 @@ class AmadeusCrawler(BaseCrawler):
                         print(f"[AMADEUS] Found: {carrier_code} ({stops} stops) | {origin}->{dest} | {currency} {price_total}")
                         
             except Exception as e:
-                # Catch specific connection errors
-                if hasattr(e, 'response') and e.response:
-                    print(f"Amadeus API Error for {origin}->{dest}: [{e.response.status_code}] {e.response.body}")
-                else:
-                    print(f"Amadeus API Error for {origin}->{dest}: {e}")
+                print(f"Error parsing Amadeus offers for {origin}->{dest}: {e}")
                 
         return flights
+
+    def _search_flight_offers(self, origin: str, dest: str, date_str: str, adults: int, children: int):
+        """Flight offers for one route from the Amadeus API, or None on error or no results."""
+        # Amadeus API supports 'children' and 'infants'
+        # We map our 'children' input to API 'children' (2-11yo)
+        # If we wanted to support infants, we would need another param.
+        req_params = {
+            "originLocationCode": self._get_iata(origin),
+            "destinationLocationCode": self._get_iata(dest),
+            "departureDate": date_str,
+            "adults": adults,
+            "max": 25,
+            "currencyCode": 'BRL'
+        }
+        if children > 0:
+            req_params["children"] = children
+
+        try:
+            response = self.amadeus.shopping.flight_offers_search.get(**req_params)
+        except Exception as e:
+            # Catch specific connection errors
+            if hasattr(e, 'response') and e.response:
+                print(f"Amadeus API Error for {origin}->{dest}: [{e.response.status_code}] {e.response.body}")
+            else:
+                print(f"Amadeus API Error for {origin}->{dest}: {e}")
+            return None
+        return response.data or None
     
     def fetch_hotels(self, cities: List[str]) -> List[Hotel]:
         return []
@@ -440,11 +679,9 @@ class AmadeusCrawler(BaseCrawler):
                 # Standard endpoint: shopping.availability.car_rentals
                 
                 # Check Cache for Cars
-                from data.database import FlightCache
-                cache = FlightCache()
                 # Use a specific provider key for cars
                 cache_key = f"{start_date}_{end_date}"
-                cached_cars_json = cache.get_cached_response(city, "RENTAL_SEARCH", cache_key, "AMADEUS_CAR")
+                cached_cars_json = self._cache.get_cached_response(city, "RENTAL_SEARCH", cache_key, "AMADEUS_CAR")
                 
                 response_data = None
                 if cached_cars_json:
@@ -460,7 +697,7 @@ class AmadeusCrawler(BaseCrawler):
                     )
                     if response.data:
                         response_data = response.data
-                        cache.save_response(city, "RENTAL_SEARCH", cache_key, response_data, "AMADEUS_CAR")
+                        self._cache.save_response(city, "RENTAL_SEARCH", cache_key, response_data, "AMADEUS_CAR")
                 
                 if response_data:
                     # Parse first few results
@@ -499,25 +736,6 @@ class AmadeusCrawler(BaseCrawler):
 
         return cars
 
-    def _get_iata(self, city_name: str) -> str:
-        # Simple Mock IATA Mapper or use Amadeus City Search
-        # For prototype, we map common Brazilian cities
-        mapping = {
-            "São Paulo": "GRU", "Sao Paulo": "GRU",
-            "Rio de Janeiro": "GIG",
-            "Belo Horizonte": "CNF",
-            "Brasília": "BSB", "Brasilia": "BSB",
-            "Salvador": "SSA",
-            "Curitiba": "CWB",
-            "Florianópolis": "FLN", "Florianopolis": "FLN",
-            "Miami": "MIA",
-            "Orlando": "MCO",
-            "New York": "JFK",
-            "Paris": "CDG",
-            "London": "LHR",
-            "Uberlândia": "UDI",
-            "Ituiutaba": "UDI",
-            "Goiânia": "GYN", "Goiania": "GYN",
-            "Aparecida de Goiânia": "GYN" # Fallback IATA for flight search if passed directly
-        }
-        return mapping.get(city_name, "GRU") # Default/Fallback
+    @staticmethod
+    def _get_iata(city_name: str) -> str:
+        return _CITY_IATA.get(_fold_city_name(city_name), "GRU") # Default/Fallback
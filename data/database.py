@@ -1,17 +1,115 @@
 import sqlite3
 import json
-from datetime import datetime
+import threading
+import weakref
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
 import os
 
 DB_PATH = "flight_cache.db"
 
+# How long a lookup that returned nothing (e.g. a hotel without offers) is skipped
+NEGATIVE_TTL_HOURS = 24
+
+# Decoded responses kept in memory per FlightCache (least recently used evicted first)
+MEMO_SIZE = 1024
+
+# How long a cached API response is served, by provider. Offer prices move fast;
+# car availability for a date range is steadier
+PROVIDER_TTL_SECONDS = {
+    "AMADEUS": 10 * 60,
+    "AMADEUS_CAR": 12 * 60 * 60,
+}
+DEFAULT_TTL_SECONDS = 10 * 60
+
+def derive_ttl_seconds(departure: datetime, now: datetime = None) -> int:
+    """
+    Cache lifetime for flight offers departing on the given date: fares close to
+    departure change quickly, those a month or more out much more slowly.
+    """
+    days_out = (departure - (now or datetime.now())).days
+    if days_out < 7:
+        return 10 * 60
+    if days_out <= 30:
+        return 60 * 60
+    return 6 * 60 * 60
+
+def _close_connections(connections):
+    for _, conn in connections:
+        conn.close()
+    connections.clear()
+
 class FlightCache:
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
+        # One connection per thread, opened on first use and kept until close()
+        # or until its thread has exited; entries are (owning thread, connection)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        # Closes what is left once the cache is collected, or at exit. It holds
+        # only the connection list, so it does not keep the cache itself alive
+        self._finalizer = weakref.finalize(self, _close_connections, self._connections)
+        # Repeat lookups within a run skip both the query and the json.loads
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+        # Response cache lookups and writes: 'hit', 'miss', 'write'
+        self.stats = Counter()
         self._init_db()
 
+    def _memo_get(self, key):
+        with self._memo_lock:
+            entry = self._memo.get(key)
+            if entry is None:
+                return None
+            data, expires_at = entry
+            if expires_at <= datetime.now():
+                del self._memo[key]
+                return None
+            self._memo.move_to_end(key)
+            return data
+
+    def _memo_put(self, key, data, expires_at):
+        with self._memo_lock:
+            self._memo[key] = (data, expires_at)
+            self._memo.move_to_end(key)
+            if len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+
+    def _memo_evict(self, keys):
+        with self._memo_lock:
+            for key in keys:
+                self._memo.pop(key, None)
+
     def _get_conn(self):
-        return sqlite3.connect(self.db_path)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can run from another thread;
+            # each connection is otherwise used by the thread that opened it
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # WAL lets readers proceed while a writer commits
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-20000")
+            self._local.conn = conn
+            with self._connections_lock:
+                # Connections left by threads that have exited (e.g. finished worker
+                # pools) would otherwise stay open until close()
+                finished = [entry for entry in self._connections if not entry[0].is_alive()]
+                self._connections[:] = [entry for entry in self._connections if entry[0].is_alive()]
+                self._connections.append((threading.current_thread(), conn))
+            for _, finished_conn in finished:
+                finished_conn.close()
+        return conn
+
+    def close(self):
+        """Closes every connection this cache has opened."""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            self._local = threading.local()
+        _close_connections(connections)
 
     def _init_db(self):
         conn = self._get_conn()
@@ -28,41 +126,129 @@ class FlightCache:
                 UNIQUE(origin, destination, date, provider)
             )
         """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS negative_cache (
+                key TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY(key, provider)
+            )
+        """)
+        # Databases created before entries expired lack the column
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(api_cache)")}
+        if "ttl_seconds" not in columns:
+            cursor.execute(f"ALTER TABLE api_cache ADD COLUMN ttl_seconds INTEGER NOT NULL DEFAULT {DEFAULT_TTL_SECONDS}")
         conn.commit()
-        conn.close()
+
+    @staticmethod
+    def _expires_at(created_at: str, ttl_seconds: int) -> datetime:
+        return datetime.fromisoformat(created_at) + timedelta(seconds=ttl_seconds)
+
+    def _ttl_for(self, provider: str, ttl_seconds: int = None) -> int:
+        return ttl_seconds if ttl_seconds is not None else PROVIDER_TTL_SECONDS.get(provider, DEFAULT_TTL_SECONDS)
 
     def get_cached_response(self, origin: str, destination: str, date: str, provider: str = "AMADEUS"):
-        """Returns the cached JSON response or None if not found."""
+        """Returns the cached JSON response, or None if not found or expired."""
+        key = (origin, destination, date, provider)
+        data = self._memo_get(key)
+        if data is not None:
+            self.stats["hit"] += 1
+            return data
         conn = self._get_conn()
         cursor = conn.cursor()
         cursor.execute("""
-            SELECT response_json FROM api_cache 
+            SELECT response_json, created_at, ttl_seconds FROM api_cache 
             WHERE origin = ? AND destination = ? AND date = ? AND provider = ?
         """, (origin, destination, date, provider))
         
         row = cursor.fetchone()
-        conn.close()
         
         if row:
-            return json.loads(row[0])
+            expires_at = self._expires_at(row[1], row[2])
+            if expires_at > datetime.now():
+                data = json.loads(row[0])
+                self._memo_put(key, data, expires_at)
+                self.stats["hit"] += 1
+                return data
+        self.stats["miss"] += 1
         return None
 
-    def save_response(self, origin: str, destination: str, date: str, data: dict, provider: str = "AMADEUS"):
-        """Saves the JSON response to the cache."""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        
-        # Serialize data to JSON
-        json_str = json.dumps(data)
+    def get_cached_responses(self, origin: str, destinations: list, date: str, provider: str = "AMADEUS") -> dict:
+        """Returns {destination: cached JSON response} for every unexpired cached destination, in one query."""
+        found = {}
+        for destination in destinations:
+            data = self._memo_get((origin, destination, date, provider))
+            if data is not None:
+                found[destination] = data
+        missing = [destination for destination in destinations if destination not in found]
+        if missing:
+            placeholders = ", ".join("?" * len(missing))
+            conn = self._get_conn()
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT destination, response_json, created_at, ttl_seconds FROM api_cache
+                WHERE origin = ? AND date = ? AND provider = ? AND destination IN ({placeholders})
+            """, (origin, date, provider, *missing))
+            now = datetime.now()
+            for destination, response_json, created_at, ttl_seconds in cursor.fetchall():
+                expires_at = self._expires_at(created_at, ttl_seconds)
+                if expires_at > now:
+                    found[destination] = data = json.loads(response_json)
+                    self._memo_put((origin, destination, date, provider), data, expires_at)
+        self.stats["hit"] += len(found)
+        self.stats["miss"] += len(destinations) - len(found)
+        return found
+
+    def save_response(self, origin: str, destination: str, date: str, data: dict, provider: str = "AMADEUS",
+                      ttl_seconds: int = None):
+        """Saves the JSON response to the cache, served for ttl_seconds (default: by provider)."""
+        self.save_responses([(origin, destination, date, data)], provider, ttl_seconds)
+
+    def save_responses(self, rows: list, provider: str = "AMADEUS", ttl_seconds: int = None):
+        """Saves (origin, destination, date, data) rows to the cache in one transaction."""
+        if not rows:
+            return
+        self._memo_evict([(origin, destination, date, provider) for origin, destination, date, _ in rows])
+        ttl_seconds = self._ttl_for(provider, ttl_seconds)
         created_at = datetime.now().isoformat()
-        
+        conn = self._get_conn()
+        try:
+            conn.executemany("""
+                INSERT INTO api_cache (origin, destination, date, provider, response_json, created_at, ttl_seconds)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(origin, destination, date, provider)
+                DO UPDATE SET response_json = excluded.response_json, created_at = excluded.created_at,
+                              ttl_seconds = excluded.ttl_seconds
+            """, [(origin, destination, date, provider, json.dumps(data), created_at, ttl_seconds)
+                  for origin, destination, date, data in rows])
+            conn.commit()
+            self.stats["write"] += len(rows)
+        except Exception as e:
+            conn.rollback()
+            print(f"Cache Save Error: {e}")
+
+    def mark_negative(self, key: str, provider: str = "AMADEUS_HOTEL"):
+        """Records that a lookup (e.g. offers for a hotel ID) came back empty."""
+        conn = self._get_conn()
         try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO api_cache (origin, destination, date, provider, response_json, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (origin, destination, date, provider, json_str, created_at))
+            conn.execute("""
+                INSERT INTO negative_cache (key, provider, created_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(key, provider) DO UPDATE SET created_at = excluded.created_at
+            """, (key, provider, datetime.now().isoformat()))
             conn.commit()
         except Exception as e:
+            conn.rollback()
             print(f"Cache Save Error: {e}")
-        finally:
-            conn.close()
+
+    def is_negative(self, key: str, provider: str = "AMADEUS_HOTEL", ttl_hours: float = NEGATIVE_TTL_HOURS) -> bool:
+        """True if the lookup came back empty within the last ttl_hours."""
+        cutoff = (datetime.now() - timedelta(hours=ttl_hours)).isoformat()
+        conn = self._get_conn()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 1 FROM negative_cache
+            WHERE key = ? AND provider = ? AND created_at >= ?
+        """, (key, provider, cutoff))
+        row = cursor.fetchone()
+        return row is not None
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import List, Optional
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class Flight:
     origin: str
     destination: str
@@ -20,14 +20,14 @@ class Flight:
     def formatted_price(self):
         return f"R$ {self.price:,.2f}"
 
-@dataclass
+@dataclass(slots=True)
 class Hotel:
     city: str
     name: str
     price_per_night: float
     rating: float
 
-@dataclass
+@dataclass(slots=True)
 class CarRental:
     city: str
     company: str
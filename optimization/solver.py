@@ -1,108 +1,259 @@
+import os
 from pulp import *
 import numpy as np
 import pandas as pd
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
+from time import monotonic
 from data.models import Flight, Hotel, CarRental, TravelRequest
 
-def solve_itinerary(
-    request: TravelRequest,
-    flights: List[Flight],
-    hotels: List[Hotel],
-    cars: List[CarRental]
-) -> Dict:
-    
-    # 1. Consolidate Cities
-    # Start with requested cities
-    req_cities = set(request.origin_cities + request.destination_cities + request.mandatory_cities)
-    
-    # Add any city appearing in the provided flights/segments
-    # This allows for intermediate hops (like expanding to nearest airport)
-    for f in flights:
-        req_cities.add(f.origin)
-        req_cities.add(f.destination)
-        
-    all_cities = list(req_cities)
-    n = len(all_cities)
-    city_map = {city: i for i, city in enumerate(all_cities)}
-    
-    # 2. Pre-process Costs and Times Matrices
-    # Initialize with high values
-    M = 999999
-    cost_matrix = np.full((n, n), M)
-    time_matrix = np.full((n, n), M)
-    flight_data = {} # (i, j) -> Flight Object
+# Try importing Numba, but fall back to plain Python if not installed
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
-    # Fill Flight Data
-    for f in flights:
-        if f.origin in city_map and f.destination in city_map:
-            i, j = city_map[f.origin], city_map[f.destination]
-            # Use the cheapest/fastest aggregation logic or just the first one found for now
-            # Here we take the one provided (assuming pre-filtered or min)
-            if f.price < cost_matrix[i, j]:
-                cost_matrix[i, j] = f.price
-                time_matrix[i, j] = f.duration_minutes
-                flight_data[(i, j)] = f
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable bare or with options."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
-    # Fill Hotel and Car Costs (Optional addition to node cost, simplifies to edge for now or separate var)
-    # For TSP, we usually associate costs with edges. 
-    # Let's approximate: Stay cost = Avg Hotel Price * 2 nights (simple assumption for the model)
-    hotel_costs = {city: 0 for city in all_cities}
-    for h in hotels:
-        if h.city in hotel_costs:
-            hotel_costs[h.city] = h.price_per_night
+# HiGHS (highspy) is driven in memory through its Python API; without it PuLP
+# writes an LP file and runs the CBC binary on it
+try:
+    import highspy
+    HAS_HIGHS = True
+except ImportError:
+    HAS_HIGHS = False
+
+# Largest one-way problem solved by the Held-Karp DP instead of CBC.
+# The DP is O(n^2 * 2^n), so keep it small when it runs as plain Python.
+HELD_KARP_MAX_NODES = 16 if HAS_NUMBA else 10
+
+# Solver settings for the path ILP: all cores, a wall-clock cap shared by all
+# cut-and-resolve rounds and, for CBC, presolve and cuts on and a fixed seed so
+# repeated solves pick the same optimum
+CBC_THREADS = os.cpu_count() or 4
+CBC_TIME_LIMIT_S = 60
+
+# Sentinel travel time (minutes) for edges without a flight in the int32 time matrix
+NO_EDGE_MINUTES = np.iinfo(np.int32).max
+
+# Assumed speed for synthetic (distance-priced) edges, matching the ground segment estimate
+SYNTHETIC_SPEED_KMH = 80.0
+
+@njit(cache=True)
+def reduce_edges(origins: np.ndarray, dests: np.ndarray, prices: np.ndarray, durations: np.ndarray,
+                 wc: float, wt: float, pax: int, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Picks the lowest-score flight (wc * price * pax + wt * duration) per (i, j) edge.
+    Returns (cost, time, best_idx) as (n, n) arrays; edges without a flight hold
+    +inf cost, NO_EDGE_MINUTES time and index -1. The first flight listed wins ties.
+    Money stays float64 so fares are not rounded; whole minutes and flight
+    indices fit in int32, halving those two matrices.
+    """
+    score = np.full((n, n), np.inf)
+    cost = np.full((n, n), np.inf)
+    time = np.full((n, n), NO_EDGE_MINUTES, dtype=np.int32)
+    best_idx = np.full((n, n), -1, dtype=np.int32)
+    for k in range(origins.shape[0]):
+        i = origins[k]
+        j = dests[k]
+        s = wc * prices[k] * pax + wt * durations[k]
+        if s < score[i, j]:
+            score[i, j] = s
+            cost[i, j] = prices[k]
+            time[i, j] = durations[k]
+            best_idx[i, j] = k
+    return cost, time, best_idx
+
+@njit(cache=True)
+def follow_successors(next_hop: np.ndarray, start: int, is_end: np.ndarray, max_steps: int) -> np.ndarray:
+    """
+    Walks the chosen successor of each node (next_hop[i], -1 for none) from start
+    until an end node, a dead end or max_steps hops. Returns the visited node indices.
+    """
+    path = np.empty(max_steps + 1, dtype=np.int64)
+    path[0] = start
+    size = 1
+    current = start
+    while size <= max_steps:
+        nxt = next_hop[current]
+        if nxt < 0:
+            break
+        current = nxt
+        path[size] = current
+        size += 1
+        # Stopping Condition: reached the designated End node
+        if is_end[current]:
+            break
+    return path[:size]
+
+@njit(cache=True)
+def held_karp(cost: np.ndarray, is_start: np.ndarray, is_end: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Bitmask DP for the cheapest simple path that starts at any is_start node
+    and ends at any is_end node. cost[i, j] is +inf where there is no edge.
+    Returns (total cost, path as node indices); (inf, empty) if no path exists.
+    """
+    n = cost.shape[0]
+    full = 1 << n
+    # dp[mask, i]: cheapest path visiting exactly the nodes in mask, ending at i
+    dp = np.full((full, n), np.inf)
+    parent = np.full((full, n), -1, dtype=np.int64)
+    for s in range(n):
+        if is_start[s]:
+            dp[1 << s, s] = 0.0
+
+    best = np.inf
+    best_mask = 0
+    best_end = -1
+    # Every transition goes to a larger mask, so dp[mask] is final when we reach it
+    for mask in range(1, full):
+        for i in range(n):
+            d = dp[mask, i]
+            if d == np.inf:
+                continue
+            if is_end[i] and d < best:
+                best = d
+                best_mask = mask
+                best_end = i
+            for j in range(n):
+                if mask & (1 << j):
+                    continue
+                c = cost[i, j]
+                if c == np.inf:
+                    continue
+                nxt = mask | (1 << j)
+                if d + c < dp[nxt, j]:
+                    dp[nxt, j] = d + c
+                    parent[nxt, j] = i
+
+    if best_end == -1:
+        return best, np.empty(0, dtype=np.int64)
+
+    size = 0
+    m = best_mask
+    while m:
+        size += m & 1
+        m >>= 1
+    path = np.empty(size, dtype=np.int64)
+    mask = best_mask
+    node = best_end
+    for k in range(size - 1, -1, -1):
+        path[k] = node
+        prev = parent[mask, node]
+        mask ^= 1 << node
+        node = prev
+    return best, path
+
+def _short_route(edge_cost: np.ndarray, origin: int, destination: int) -> Optional[List[int]]:
+    """
+    Exact answer for a single origin/destination pair without a solver, when one
+    can be proven: the direct edge or the best two-leg route, provided no route
+    with three or more legs can be cheaper. edge_cost holds the non-negative edge
+    coefficients, +inf where there is no flight (including the diagonal).
+    Returns the path as city indices, or None if a full solve is still needed.
+    """
+    if origin == destination:
+        return [origin]
+
+    hubs = np.ones(edge_cost.shape[0], dtype=np.bool_)
+    hubs[[origin, destination]] = False
+    direct = edge_cost[origin, destination]
+    two_leg = edge_cost[origin, hubs] + edge_cost[hubs, destination]
+    best_two = two_leg.min() if two_leg.size else np.inf
+    best = min(direct, best_two)
+    if not np.isfinite(best):
+        return None
+
+    # Any longer route leaves the origin, hops between two hubs and enters the destination
+    if two_leg.size > 1:
+        bound = edge_cost[origin, hubs].min() + edge_cost[np.ix_(hubs, hubs)].min() + edge_cost[hubs, destination].min()
+        if best > bound:
+            return None
+
+    if direct <= best_two:
+        return [origin, destination]
+    return [origin, int(np.flatnonzero(hubs)[two_leg.argmin()]), destination]
+
+def _ilp_solver(time_limit: int) -> LpSolver:
+    """
+    HiGHS through its in-memory API when highspy is installed, so no model file
+    round trip sits in front of every solve; otherwise the CBC command line solver.
+    """
+    if HAS_HIGHS:
+        return HiGHS(msg=False, threads=CBC_THREADS, timeLimit=time_limit)
+    return PULP_CBC_CMD(
+        msg=0, threads=CBC_THREADS, presolve=True, cuts=True, strong=5,
+        timeLimit=time_limit, options=["randomCbcSeed 1", "preprocess equal"]
+    )
+
+def _subtours(chosen: List[Tuple[int, int]], n: int) -> List[List[int]]:
+    """
+    Node sets of the cycles left in an ILP solution without subtour constraints.
+    Nodes lacking a chosen in- or out-edge are peeled off until none are left;
+    every connected piece of what remains has at least as many chosen edges as
+    nodes, so each one violates its subtour elimination constraint.
+    """
+    indeg = np.zeros(n, dtype=np.int64)
+    outdeg = np.zeros(n, dtype=np.int64)
+    for i, j in chosen:
+        outdeg[i] += 1
+        indeg[j] += 1
+
+    alive = set(chosen)
+    peeled = True
+    while peeled:
+        peeled = False
+        for i, j in list(alive):
+            if indeg[i] == 0 or outdeg[j] == 0:
+                alive.discard((i, j))
+                outdeg[i] -= 1
+                indeg[j] -= 1
+                peeled = True
+
+    # Group the surviving edges into weakly connected pieces
+    parent = list(range(n))
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+    for i, j in alive:
+        parent[find(i)] = find(j)
+
+    pieces = {}
+    for node in sorted({k for e in alive for k in e}):
+        pieces.setdefault(find(node), []).append(node)
+    return list(pieces.values())
+
+def _solve_ilp(request: TravelRequest, all_cities: List[str], coef: np.ndarray, idxs: np.ndarray) -> Tuple[str, List[int]]:
+    """
+    Solves the open-path model as an ILP with HiGHS or CBC, adding subtour elimination
+    constraints lazily: only for the cycles a solution actually contains.
+    Returns the solver status and the chosen path as city indices.
+    """
+    n = len(all_cities)
 
-    # 3. PuLP Model
     prob = LpProblem("Travel_Optimization", LpMinimize)
 
     # Variables
-    # x[i, j] = 1 if flight from i to j
-    x = LpVariable.dicts("x", [(i, j) for i in range(n) for j in range(n) if i != j], cat='Binary')
-    # u[i] = sequence number for MTZ
-    u = LpVariable.dicts("u", range(n), lowBound=0, upBound=n, cat='Continuous')
+    # x[i, j] = 1 if flight from i to j; only edges backed by a flight get a variable
+    edges = [tuple(e) for e in idxs.tolist()]
+    x = LpVariable.dicts("x", edges, cat='Binary')
+    out_neighbors = [[] for _ in range(n)]
+    in_neighbors = [[] for _ in range(n)]
+    for i, j in edges:
+        out_neighbors[i].append(j)
+        in_neighbors[j].append(i)
 
-    # Objective Function
-    # Cost Component: Flight Price * Pax + Hotel (approx)
-    # Time Component: Flight Duration
-    
-    obj_terms = []
-    
-    total_pax = request.pax_adults + request.pax_children
-    
-    for i in range(n):
-        for j in range(n):
-            if i == j: continue
-            
-            # Weighted Cost
-            # Flight Cost
-            f_cost = cost_matrix[i, j]
-            if f_cost == M: continue # Skip invalid edges
-            
-            # Hotel Cost at destination + Daily Cost
-            # logic: If we fly i -> j, we stay in j for 'stay_days_per_city'
-            # (Exception: if j is the final destination and we return immediately? 
-            #  Assumption: User spends time in every destination visited)
-            
-            unit_hotel_cost = hotel_costs.get(all_cities[j], 0)
-            unit_daily_cost = request.daily_cost_per_person
-            days = request.stay_days_per_city
-            
-            # Total Stay Cost for this leg (Hotel for group + Daily for group)
-            # Hotel is usually per room, but let's assume price_per_night is effectively covered
-            # or simplified: HotelPrice * Days. 
-            # Note: HotelPrice might be per person or per room. Model says "price_per_night". 
-            # Let's assume one room fits all or costs are scaled. The prompt says "Optimize cost".
-            # Safest is to treat Hotel Cost as total for the group or per person?
-            # Let's add them up.
-            
-            stay_cost_total = (unit_hotel_cost * days) + (unit_daily_cost * days * total_pax)
-            
-            total_money = (f_cost * total_pax) + stay_cost_total
-            total_minutes = time_matrix[i, j]
-            
-            term = x[i, j] * (request.weight_cost * total_money + request.weight_time * total_minutes)
-            obj_terms.append(term)
-            
-    prob += lpSum(obj_terms)
+    # Expressions are built straight from (variable, coefficient) pairs; lpSum would
+    # allocate and copy an intermediate expression per term. The coefficients are
+    # gathered for all edges in one fancy-indexing pass, in the same order as edges.
+    edge_coef = coef[idxs[:, 0], idxs[:, 1]].tolist()
+    prob += LpAffineExpression(zip((x[e] for e in edges), edge_coef))
 
     # Constraints
     
@@ -127,39 +278,26 @@ def solve_itinerary(
     is_start = LpVariable.dicts("is_start", range(n), cat='Binary')
     is_end = LpVariable.dicts("is_end", range(n), cat='Binary')
     
-    # Force start to be one of the origin_cities
+    # Start must be one of the origin_cities. The end must be in destination_cities
+    # (One Way) or, for a Round Trip, in origin_cities as well.
+    # Ineligible cities get their binary fixed to 0 through its upper bound, which
+    # CBC's presolve drops outright, instead of posting one x == 0 row per city.
+    origin_set = set(request.origin_cities)
+    end_set = origin_set if request.is_round_trip else set(request.destination_cities)
     for i, city in enumerate(all_cities):
-        if city not in request.origin_cities:
-            prob += is_start[i] == 0
+        if city not in origin_set:
+            is_start[i].upBound = 0
+        if city not in end_set:
+            is_end[i].upBound = 0
 
-    # End Constraint logic
     if request.is_round_trip:
-        # If Round Trip, End City MUST be the same as Start City?
-        # Or at least one of the Origin Cities?
-        # Let's enforce that End City must be in origin_cities.
-        # AND we must ensure a cycle? Standard TSP uses sum(x_ij)=1 for all if cycle.
-        # But we surely have intermediate nodes that are visited once.
-        # Let's rely on Flow Conservation with Start/End being same set.
-        
-        for i, city in enumerate(all_cities):
-             if city not in request.origin_cities:
-                 prob += is_end[i] == 0
-                 
-        # Additional constraint: The specific City picked as Start must be the same as End?
-        # Usually yes: SP -> Rio -> SP.
-        # prob += is_start[i] == is_end[i] for all i
+        # The specific City picked as Start must be the same as End: SP -> Rio -> SP.
         for i in range(n):
             prob += is_start[i] == is_end[i]
-            
-    else:
-        # One Way: End must be in destination_cities
-        for i, city in enumerate(all_cities):
-             if city not in request.destination_cities:
-                 prob += is_end[i] == 0
 
     # Exactly one start and one end
-    prob += lpSum([is_start[i] for i in range(n)]) == 1
-    prob += lpSum([is_end[i] for i in range(n)]) == 1
+    prob += LpAffineExpression((is_start[i], 1) for i in range(n)) == 1
+    prob += LpAffineExpression((is_end[i], 1) for i in range(n)) == 1
         
     # Flow Constraints
     for k in range(n):
@@ -176,22 +314,165 @@ def solve_itinerary(
         
         # Let's keep logic: Out - In = Start - End
         # If Start==End, then Out=In for all. Which allows disjoint cycles.
-        # We need MTZ to prevent disjoint sub-tours.
+        # We need subtour elimination to prevent disjoint sub-tours.
         
-        prob += lpSum([x[k, j] for j in range(n) if k != j]) - lpSum([x[i, k] for i in range(n) if i != k]) == is_start[k] - is_end[k]
+        flow = [(x[k, j], 1) for j in out_neighbors[k]] + [(x[i, k], -1) for i in in_neighbors[k]]
+        flow += [(is_start[k], -1), (is_end[k], 1)]
+        prob += LpAffineExpression(flow) == 0
 
-    # Connectivity / MTZ
-    # u_i - u_j + N*x_ij <= N-1
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                prob += u[i] - u[j] + n * x[i, j] <= n - 1
+    # Connectivity: subtour elimination constraints, added lazily
+    # Solve without them, then for every cycle S left in the solution add
+    # sum(x_ij for i, j in S) <= |S| - 1 and resolve, until the chosen edges form a
+    # single path. Only the handful of violated cuts ever reach CBC, instead of the
+    # Theta(n^2) MTZ rows and their weak LP relaxation.
+    deadline = monotonic() + CBC_TIME_LIMIT_S
+    while True:
+        prob.solve(_ilp_solver(max(1, round(deadline - monotonic()))))
+        status = LpStatus[prob.status]
+        if status != 'Optimal':
+            return status, []
 
-    # Solve
-    prob.solve(PULP_CBC_CMD(msg=0))
+        chosen = [e for e, var in x.items() if (var.varValue or 0) > 0.5]
+        cycles = _subtours(chosen, n)
+        if not cycles:
+            break
+        if monotonic() >= deadline:
+            return 'Not Solved', []
+        for cycle in cycles:
+            members = set(cycle)
+            inside = [(x[i, j], 1) for i in cycle for j in out_neighbors[i] if j in members]
+            prob += LpAffineExpression(inside) <= len(cycle) - 1
+
+    # Pull the decision values out of PuLP in one pass, then walk them
+    # Edges are in row-major order, so the lowest-index chosen successor wins
+    next_hop = np.full(n, -1, dtype=np.int64)
+    for i, j in chosen:
+        if next_hop[i] < 0:
+            next_hop[i] = j
+    start_flags = np.array([round(is_start[i].varValue or 0) for i in range(n)], dtype=np.int8)
+    end_flags = np.array([round(is_end[i].varValue or 0) == 1 for i in range(n)], dtype=np.bool_)
+
+    start_node = int(np.argmax(start_flags))
+    path = follow_successors(next_hop, start_node, end_flags, n + 5).tolist() # Safety limit
+
+    return status, path
+
+def solve_itinerary(
+    request: TravelRequest,
+    flights: List[Flight],
+    hotels: List[Hotel],
+    cars: List[CarRental],
+    synthetic_cost_per_km: Optional[float] = None
+) -> Dict:
+    """
+    Picks the best itinerary over the given flights.
+    With synthetic_cost_per_km set, city pairs without any flight get a
+    great-circle distance priced edge, so routes with a missing hop stay solvable.
+    """
+    
+    # 1. Consolidate Cities
+    # Start with requested cities, then add any city appearing in the provided
+    # flights/segments. This allows for intermediate hops (like expanding to
+    # nearest airport). dict.fromkeys keeps first-seen order, so city indices
+    # (and solver tie-breaks) are the same on every run.
+    all_cities = list(dict.fromkeys(
+        request.origin_cities + request.destination_cities + request.mandatory_cities
+        + [c for f in flights for c in (f.origin, f.destination)]
+    ))
+    n = len(all_cities)
+    city_map = {city: i for i, city in enumerate(all_cities)}
     
+    # 2. Pre-process Costs and Times Matrices
+    # Edges without a flight stay at +inf
+    flight_data = {} # (i, j) -> Flight Object
+
+    total_pax = request.pax_adults + request.pax_children
+
+    # Fill Flight Data
+    # Keep the best-scoring flight per (i, j) edge. Every flight endpoint is in
+    # city_map by construction, so the columns are gathered without a filter pass.
+    count = len(flights)
+    origins = np.fromiter((city_map[f.origin] for f in flights), dtype=np.int32, count=count)
+    dests = np.fromiter((city_map[f.destination] for f in flights), dtype=np.int32, count=count)
+    prices = np.fromiter((f.price for f in flights), dtype=np.float64, count=count)
+    durations = np.fromiter((f.duration_minutes for f in flights), dtype=np.int32, count=count)
+
+    cost_matrix, time_matrix, best_idx = reduce_edges(
+        origins, dests, prices, durations, request.weight_cost, request.weight_time, total_pax, n
+    )
+    for i, j in np.argwhere(best_idx >= 0).tolist():
+        flight_data[(i, j)] = flights[best_idx[i, j]]
+
+    # Optional distance-priced fallback for edges with no flight (off by default)
+    if synthetic_cost_per_km is not None:
+        from app.services.geo_service import get_coords_bulk, pairwise_haversine
+        km = pairwise_haversine(get_coords_bulk(all_cities))
+        missing = np.isinf(cost_matrix) & np.isfinite(km)
+        np.fill_diagonal(missing, False)
+        cost_matrix[missing] = km[missing] * synthetic_cost_per_km
+        time_matrix[missing] = np.rint(km[missing] / SYNTHETIC_SPEED_KMH * 60)
+
+    # Fill Hotel and Car Costs (Optional addition to node cost, simplifies to edge for now or separate var)
+    # For TSP, we usually associate costs with edges. 
+    # Let's approximate: Stay cost = Avg Hotel Price * 2 nights (simple assumption for the model)
+    # Nightly hotel price per city index (the last hotel listed for a city wins)
+    hotel_price = {h.city: h.price_per_night for h in hotels}
+    hotel_vec = np.array([hotel_price.get(city, 0.0) for city in all_cities], dtype=np.float64)
+
+    # Objective Function
+    # Cost Component: Flight Price * Pax + Hotel (approx)
+    # Time Component: Flight Duration
+    
+    # Hotel Cost at destination + Daily Cost
+    # logic: If we fly i -> j, we stay in j for 'stay_days_per_city'
+    # (Assumption: User spends time in every destination visited)
+    # Hotel price_per_night is treated as the total for the group; daily cost is per person.
+    # Computed once per destination j, as it does not depend on the origin
+    days = request.stay_days_per_city
+    hotel_stay = hotel_vec * days
+    stay_cost = hotel_stay + (request.daily_cost_per_person * days * total_pax)
+
+    # Only edges backed by a flight enter the objective
+    edge_mask = np.isfinite(cost_matrix)
+    np.fill_diagonal(edge_mask, False)
+    idxs = np.argwhere(edge_mask)
+
+    # Weighted coefficient per edge: flight cost for the group + stay at j, and flight time
+    coef = np.zeros((n, n), dtype=np.float64)
+    coef[edge_mask] = (
+        request.weight_cost * (cost_matrix[edge_mask] * total_pax + stay_cost[idxs[:, 1]])
+        + request.weight_time * time_matrix[edge_mask]
+    )
+
+    # 3. Solve
+    # A single one-way origin/destination pair is often settled by the direct or a
+    # two-leg route; inputs without any edge are settled without a solver;
+    # otherwise Held-Karp DP for small one-way trips, and the path ILP for round
+    # trips and larger inputs
+    edge_cost = np.where(edge_mask, coef, np.inf)
+    origin_set = set(request.origin_cities)
+    dest_set = origin_set if request.is_round_trip else set(request.destination_cities)
+    path = None
+    if not request.is_round_trip and len(request.origin_cities) == 1 and len(request.destination_cities) == 1:
+        path = _short_route(edge_cost, city_map[request.origin_cities[0]], city_map[request.destination_cities[0]])
+
+    if path is not None:
+        status = 'Optimal'
+    elif idxs.size == 0:
+        # No usable edge (a single city, or no flights between them): the only
+        # possible trip is a zero-leg one in a city that can both start and end it
+        stay = next((i for i, city in enumerate(all_cities) if city in origin_set and city in dest_set), None)
+        status, path = ('Optimal', [stay]) if stay is not None else ('Infeasible', [])
+    elif not request.is_round_trip and n <= HELD_KARP_MAX_NODES:
+        is_start = np.array([city in origin_set for city in all_cities], dtype=np.bool_)
+        is_end = np.array([city in dest_set for city in all_cities], dtype=np.bool_)
+        best_cost, best_path = held_karp(edge_cost, is_start, is_end)
+        status = 'Optimal' if np.isfinite(best_cost) else 'Infeasible'
+        path = best_path.tolist()
+    else:
+        status, path = _solve_ilp(request, all_cities, coef, idxs)
+
     # Reconstruct
-    status = LpStatus[prob.status]
     itinerary = []
     total_cost_val = 0.0
     total_duration_val = 0
@@ -204,108 +485,64 @@ def solve_itinerary(
     }
     
     if status == 'Optimal':
-        # Find start node
-        start_node = -1
-        for i in range(n):
-            if value(is_start[i]) == 1:
-                start_node = i
-                break
-        
-        current = start_node
-        visited = {current}
-        
-        # Guard against infinite loops if solver allows cycles (Round Trip)
-        # For Round Trip, we expect to visit Start again at the very end.
-        
-        steps = 0
-        while steps < n + 5: # Safety limit
-            # Find next hop
-            next_hop = -1
-            found_next = False
-            for j in range(n):
-                if current != j and value(x[current, j]) == 1:
-                    next_hop = j
-                    found_next = True
-                    break
-            
-            if found_next:
-                f = flight_data.get((current, next_hop))
-                price = cost_matrix[current, next_hop] if f is None else f.price
-                duration = time_matrix[current, next_hop] if f is None else f.duration_minutes
-                
-                leg_cost = price
-                
-                # Check Carrier Type for breakdown
-                airline_lower = f.airline.lower() if f else ""
-                if "carro" in airline_lower or "rent" in airline_lower:
-                    breakdown["car"] += leg_cost
-                else:
-                    breakdown["flight"] += leg_cost
-                
-                # Add implicit hotel/stay cost to total (for reporting correct optimizer cost)
-                # Note: The optimizer used these costs to decide, so we should reflect them?
-                # Or just return movement costs? 
-                # The user expects "Total Cost". Let's add stay costs to the leg-associated breakdown if possible
-                # or just keep it separate. 
-                # The 'itinerary' list usually shows movement. 
-                # Let's NOT add it to 'price' of the flight leg to avoid confusion in UI.
-                # But we must track it for the optimization score verification.
-                
-                # Re-calculate stay cost for this node to add to total_cost_val
-                # We are going TO next_hop.
-                unit_h = hotel_costs.get(all_cities[next_hop], 0)
-                unit_d = request.daily_cost_per_person
-                d_days = request.stay_days_per_city
-                stay_total = (unit_h * d_days) + (unit_d * d_days * total_pax)
-                
-                breakdown["hotel"] += (unit_h * d_days) # Tracking pure hotel
-                # daily cost is not in breakdown keys yet, but total_cost_val should include it
-                
-                # total_cost_val in this loop is accumulating the "Money" part of the objective?
-                # Original code: total_cost_val += price. 
-                # If we want the validation to match the "Custo Total" displayed, we should probably
-                # let the UI calculate the static costs (Hotel * Days) as it does now, 
-                # OR return the Solver's view of cost.
-                # The UI adds them separately. 
-                # IMPORTANT: If we add them here to total_cost_val, the UI might double count if it ALSO adds them.
-                # Let's check app.py: 
-                # app.py calculates: custo_total_viagem = custo_voos + custo_hospedagem...
-                # So we should KEEP 'total_cost_val' here as just the flight prices for consistency with existing UI structure,
-                # UNLESS we change UI to use solver's total.
-                # Given instructions, I shouldn't break UI. 
-                # I will leave total_cost_val as movement cost, but the DECISION (x[i,j]) was made using the full cost.
-                # This is correct: The Logic considers it, but the Reporting can stay modular.
-                
-                # However, for 'breakdown' I will leave as is for compatibility.
-                
-                # Add implicit hotel cost if spending time? 
-                # Currently we only track movement costs.
-                
-                itinerary.append({
-                    "from": all_cities[current],
-                    "to": all_cities[next_hop],
-                    "flight": f,
-                    "price": price,
-                    "duration": duration,
-                    "price_formatted": f"R$ {price:.2f}"
-                })
-                total_cost_val += price
-                total_duration_val += duration
-                current = next_hop
-                
-                steps += 1
-                
-                # Stopping Condition
-                # If we reached the designated End node
-                if value(is_end[current]) == 1:
-                    # If Round Trip, we must ensure we haven't just started (steps > 0)
-                    if request.is_round_trip:
-                         break
-                    else:
-                         break
+        hotel_stay_list = hotel_stay.tolist()
+        for current, next_hop in zip(path, path[1:]):
+            f = flight_data.get((current, next_hop))
+            price = cost_matrix[current, next_hop] if f is None else f.price
+            duration = int(time_matrix[current, next_hop]) if f is None else f.duration_minutes
+
+            leg_cost = price
+
+            # Check Carrier Type for breakdown
+            airline_lower = f.airline.lower() if f else ""
+            if "carro" in airline_lower or "rent" in airline_lower:
+                breakdown["car"] += leg_cost
             else:
-                break
-                
+                breakdown["flight"] += leg_cost
+
+            # Add implicit hotel/stay cost to total (for reporting correct optimizer cost)
+            # Note: The optimizer used these costs to decide, so we should reflect them?
+            # Or just return movement costs? 
+            # The user expects "Total Cost". Let's add stay costs to the leg-associated breakdown if possible
+            # or just keep it separate. 
+            # The 'itinerary' list usually shows movement. 
+            # Let's NOT add it to 'price' of the flight leg to avoid confusion in UI.
+            # But we must track it for the optimization score verification.
+
+            # Stay cost at the node we are going TO (next_hop), precomputed per city
+            breakdown["hotel"] += hotel_stay_list[next_hop] # Tracking pure hotel
+            # daily cost is not in breakdown keys yet, but total_cost_val should include it
+
+            # total_cost_val in this loop is accumulating the "Money" part of the objective?
+            # Original code: total_cost_val += price. 
+            # If we want the validation to match the "Custo Total" displayed, we should probably
+            # let the UI calculate the static costs (Hotel * Days) as it does now, 
+            # OR return the Solver's view of cost.
+            # The UI adds them separately. 
+            # IMPORTANT: If we add them here to total_cost_val, the UI might double count if it ALSO adds them.
+            # Let's check app.py: 
+            # app.py calculates: custo_total_viagem = custo_voos + custo_hospedagem...
+            # So we should KEEP 'total_cost_val' here as just the flight prices for consistency with existing UI structure,
+            # UNLESS we change UI to use solver's total.
+            # Given instructions, I shouldn't break UI. 
+            # I will leave total_cost_val as movement cost, but the DECISION (x[i,j]) was made using the full cost.
+            # This is correct: The Logic considers it, but the Reporting can stay modular.
+
+            # However, for 'breakdown' I will leave as is for compatibility.
+
+            # Add implicit hotel cost if spending time? 
+            # Currently we only track movement costs.
+
+            itinerary.append({
+                "from": all_cities[current],
+                "to": all_cities[next_hop],
+                "flight": f,
+                "price": price,
+                "duration": duration,
+                "price_formatted": f"R$ {price:.2f}"
+            })
+            total_cost_val += price
+            total_duration_val += duration
     return {
         "status": status,
         "itinerary": itinerary,
@@ -2,7 +2,7 @@
 Solver Service Schemas - Pydantic models for solver requests and responses
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from typing import List, Optional, Dict
 from datetime import datetime
 
@@ -81,10 +81,15 @@ class ItineraryLegSchema(BaseModel):
     flight: Optional[FlightSchema] = None
     price: float
     duration: int
-    price_formatted: str
     origin_coords: Optional[List[float]] = None
     dest_coords: Optional[List[float]] = None
 
+    # Formatted on serialization only, instead of once per leg while building the itinerary
+    @computed_field
+    @property
+    def price_formatted(self) -> str:
+        return f"R$ {self.price:.2f}"
+
 
 class SolveResponseSchema(BaseModel):
     """Response from solver"""
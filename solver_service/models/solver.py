@@ -421,8 +421,7 @@ def solve_itinerary(
                     destination=all_cities[j],
                     flight=flight,
                     price=price,
-                    duration=duration,
-                    price_formatted=f"R$ {price:.2f}"
+                    duration=duration
                 )
                 itinerary.append(leg)
                 
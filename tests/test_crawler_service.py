@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+from app.services.crawler_service import AmadeusCrawler
+from data.database import FlightCache
+
+
+class ApiError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = SimpleNamespace(status_code=status_code, body="")
+
+
+def _crawler(tmp_path, offers_status):
+    crawler = AmadeusCrawler.__new__(AmadeusCrawler)
+    crawler.client_ready = True
+    crawler._seen_hotel_ids = set()
+    crawler._cache = FlightCache(str(tmp_path / "cache.db"))
+
+    def hotels_by_city(**params):
+        return SimpleNamespace(data=[{"hotelId": "H1"}, {"hotelId": "H2"}])
+
+    def hotel_offers(hotelIds, **params):
+        # The batched call fails, then each hotel gets offers_status
+        raise ApiError(400 if "," in hotelIds else offers_status[hotelIds])
+
+    crawler.amadeus = SimpleNamespace(
+        reference_data=SimpleNamespace(locations=SimpleNamespace(hotels=SimpleNamespace(
+            by_city=SimpleNamespace(get=hotels_by_city)))),
+        shopping=SimpleNamespace(hotel_offers_search=SimpleNamespace(get=hotel_offers)),
+    )
+    return crawler
+
+def test_only_rejected_hotel_ids_are_marked_negative(tmp_path):
+    crawler = _crawler(tmp_path, {"H1": 404, "H2": 429})
+    assert crawler.fetch_hotels(["São Paulo"]) == []
+    assert crawler._cache.is_negative("H1")
+    # A rate-limited hotel says nothing about its offers
+    assert not crawler._cache.is_negative("H2")
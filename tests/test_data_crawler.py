@@ -0,0 +1,103 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from data.database import FlightCache
+from data.crawler import AmadeusCrawler, MockCrawler, _first_known_airline, iso_duration_minutes, iter_flight_card_texts
+
+
+PAGE = """
+<html><head><script>var x = "R$ 1";</script></head><body>
+<ul>
+  <li class="pIav2d abc"><span>Latam</span><span>R$ 1.234,56</span><span>2h 15m</span></li>
+  <li class="other"><span>Ignored</span></li>
+  <li class="xpIav2d"><span>Gol</span><span>R$ 500</span></li>
+</ul>
+<div role="listitem">Not a card when pIav2d items exist</div>
+</body></html>
+"""
+
+def test_iter_flight_card_texts_prefers_card_class():
+    assert list(iter_flight_card_texts(PAGE)) == ["Latam | R$ 1.234,56 | 2h 15m", "Gol | R$ 500"]
+
+def test_iter_flight_card_texts_falls_back_to_list_items():
+    page = '<div role="listitem"><b>Azul</b><i>R$ 300</i></div><div>R$ 1</div>'
+    assert list(iter_flight_card_texts(page)) == ["Azul | R$ 300"]
+
+def test_mock_crawler_is_repeatable_with_a_seed():
+    date = datetime(2025, 1, 1)
+    flights = MockCrawler(seed=7).fetch_flights("A", ["A", "B", "C"], date)
+    assert flights == MockCrawler(seed=7).fetch_flights("A", ["A", "B", "C"], date)
+    assert {f.destination for f in flights} == {"B", "C"}
+    assert 6 <= len(flights) <= 10
+    for f in flights:
+        assert type(f.price) is float and 200 <= f.price <= 1500
+        assert type(f.duration_minutes) is int and 45 <= f.duration_minutes <= 300
+        assert (f.arrival_time - f.departure_time).total_seconds() == f.duration_minutes * 60
+
+    hotels = MockCrawler(seed=7).fetch_hotels(["A"])
+    assert 3 <= len(hotels) <= 6 and all(h.name.endswith(" A") for h in hotels)
+    assert 2 <= len(MockCrawler(seed=7).fetch_car_rentals(["A"])) <= 4
+
+def test_iso_duration_minutes():
+    assert iso_duration_minutes("PT2H45M") == 165
+    assert iso_duration_minutes("PT45M") == 45
+    assert iso_duration_minutes("PT3H") == 180
+    assert iso_duration_minutes("P1DT2H5M") == 1565
+    assert iso_duration_minutes("PT1H30M59S") == 90
+    for bad in ("2H", "P1M", "PT1.5H", "PT2D"):
+        with pytest.raises(ValueError):
+            iso_duration_minutes(bad)
+
+def test_amadeus_iata_lookup_ignores_case_and_accents():
+    assert AmadeusCrawler._get_iata("São Paulo") == AmadeusCrawler._get_iata("sao paulo") == "GRU"
+    assert AmadeusCrawler._get_iata("Florianopolis") == "FLN"
+    assert AmadeusCrawler._get_iata("Ituiutaba") == "UDI"
+    assert AmadeusCrawler._get_iata("Nowhere") == "GRU"
+
+def test_first_known_airline_follows_priority_order():
+    # Gol is listed before Delta, even though Delta appears first in the text
+    assert _first_known_airline("Delta | operated by Gol | R$ 900") == "Gol"
+    assert _first_known_airline("Air France | 11h 5m") == "Air France"
+    assert _first_known_airline("KLM | R$ 900") == "Unknown"
+
+def _offer(dest, price):
+    segment = {"carrierCode": "LA", "number": "100", "departure": {"iataCode": "GRU", "at": "2025-01-01T08:00:00"},
+               "arrival": {"iataCode": dest, "at": "2025-01-01T09:05:00"}}
+    return {"price": {"total": price, "currency": "BRL"}, "travelerPricings": [],
+            "itineraries": [{"duration": "PT1H5M", "segments": [segment]}]}
+
+def test_amadeus_fetch_flights_searches_only_cache_misses(tmp_path):
+    crawler = AmadeusCrawler.__new__(AmadeusCrawler)
+    crawler.client_ready = True
+    crawler._cache = FlightCache(str(tmp_path / "cache.db"))
+    crawler._cache.save_response("São Paulo", "Brasília", "2025-01-01_A1_C0", [_offer("BSB", "300.00")])
+    searched = []
+
+    def search(**params):
+        searched.append(params["destinationLocationCode"])
+        if params["destinationLocationCode"] == "SSA":
+            raise RuntimeError("boom")
+        return SimpleNamespace(data=[_offer(params["destinationLocationCode"], "500.00")])
+
+    crawler.amadeus = SimpleNamespace(shopping=SimpleNamespace(flight_offers_search=SimpleNamespace(get=search)))
+    cities = ["São Paulo", "Brasília", "Rio de Janeiro", "Salvador"]
+    flights = crawler.fetch_flights("São Paulo", cities, datetime(2025, 1, 1))
+
+    assert sorted(searched) == ["GIG", "SSA"]
+    assert [(f.destination, f.price, f.duration_minutes) for f in flights] == \
+        [("Brasília", 300.0, 65), ("Rio de Janeiro", 500.0, 65)]
+    cached = crawler._cache.get_cached_responses("São Paulo", cities, "2025-01-01_A1_C0")
+    assert set(cached) == {"Brasília", "Rio de Janeiro"}
+
+def test_amadeus_fetch_flights_survives_a_broken_cache(tmp_path):
+    crawler = AmadeusCrawler.__new__(AmadeusCrawler)
+    crawler.client_ready = True
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    crawler._cache = SimpleNamespace(get_cached_responses=broken, save_responses=broken)
+    search = lambda **params: SimpleNamespace(data=[_offer(params["destinationLocationCode"], "500.00")])
+    crawler.amadeus = SimpleNamespace(shopping=SimpleNamespace(flight_offers_search=SimpleNamespace(get=search)))
+    flights = crawler.fetch_flights("São Paulo", ["Brasília", "Salvador"], datetime(2025, 1, 1))
+    assert [f.destination for f in flights] == ["Brasília", "Salvador"]
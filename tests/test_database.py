@@ -0,0 +1,104 @@
+import gc
+import sqlite3
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from datetime import datetime
+from data.database import FlightCache, derive_ttl_seconds
+
+
+def test_negative_cache_expires(tmp_path):
+    cache = FlightCache(str(tmp_path / "cache.db"))
+    assert not cache.is_negative("H1")
+    cache.mark_negative("H1")
+    assert cache.is_negative("H1")
+    assert not cache.is_negative("H1", provider="OTHER")
+    assert not cache.is_negative("H1", ttl_hours=0)
+
+def test_cached_responses_round_trip_in_bulk(tmp_path):
+    cache = FlightCache(str(tmp_path / "cache.db"))
+    assert cache.get_cached_responses("GRU", [], "2025-01-01") == {}
+    cache.save_responses([("GRU", "GIG", "2025-01-01", [{"id": 1}]), ("GRU", "BSB", "2025-01-01", [{"id": 2}])])
+    cache.save_response("GRU", "CNF", "2025-01-02", [{"id": 3}])
+    cached = cache.get_cached_responses("GRU", ["GIG", "BSB", "CNF", "SSA"], "2025-01-01")
+    assert cached == {"GIG": [{"id": 1}], "BSB": [{"id": 2}]}
+    assert cache.get_cached_response("GRU", "GIG", "2025-01-01") == [{"id": 1}]
+
+def test_connections_are_per_thread_and_reused(tmp_path):
+    cache = FlightCache(str(tmp_path / "cache.db"))
+    conn = cache._get_conn()
+    assert cache._get_conn() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        other = pool.submit(cache._get_conn).result()
+    assert other is not conn
+
+    cache.save_response("GRU", "GIG", "d", [1])
+    cache.save_response("GRU", "GIG", "d", [2])
+    assert cache.get_cached_response("GRU", "GIG", "d") == [2]
+    assert conn.execute("SELECT COUNT(*) FROM api_cache").fetchone()[0] == 1
+
+    cache.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    # A closed cache reopens on the next lookup
+    assert cache.get_cached_response("GRU", "GIG", "d") == [2]
+
+def test_lookups_are_memoised_until_saved_again(tmp_path):
+    cache = FlightCache(str(tmp_path / "cache.db"))
+    cache.save_response("GRU", "GIG", "d", [{"id": 1}])
+    first = cache.get_cached_response("GRU", "GIG", "d")
+    assert cache.get_cached_response("GRU", "GIG", "d") is first
+    assert cache.get_cached_responses("GRU", ["GIG"], "d")["GIG"] is first
+
+    cache.save_responses([("GRU", "GIG", "d", [{"id": 2}])])
+    assert cache.get_cached_response("GRU", "GIG", "d") == [{"id": 2}]
+
+def test_entries_expire_after_their_ttl(tmp_path):
+    cache = FlightCache(str(tmp_path / "cache.db"))
+    cache.save_response("GRU", "GIG", "d", [1], ttl_seconds=0)
+    cache.save_responses([("GRU", "BSB", "d", [2])])
+    assert cache.get_cached_response("GRU", "GIG", "d") is None
+    assert cache.get_cached_responses("GRU", ["GIG", "BSB"], "d") == {"BSB": [2]}
+    assert cache.stats == {"write": 2, "hit": 1, "miss": 2}
+
+def test_old_cache_table_gains_ttl_column(tmp_path):
+    path = str(tmp_path / "cache.db")
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE api_cache (id INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT NOT NULL,
+            destination TEXT NOT NULL, date TEXT NOT NULL, provider TEXT NOT NULL, response_json TEXT NOT NULL,
+            created_at TEXT NOT NULL, UNIQUE(origin, destination, date, provider))
+    """)
+    conn.execute("INSERT INTO api_cache VALUES (1, 'GRU', 'GIG', 'd', 'AMADEUS', '[1]', ?)", (datetime.now().isoformat(),))
+    conn.commit()
+    conn.close()
+    assert FlightCache(path).get_cached_response("GRU", "GIG", "d") == [1]
+
+def test_derive_ttl_seconds_grows_with_days_to_departure():
+    now = datetime(2025, 1, 1)
+    assert derive_ttl_seconds(datetime(2025, 1, 3), now) == 600
+    assert derive_ttl_seconds(datetime(2025, 1, 20), now) == 3600
+    assert derive_ttl_seconds(datetime(2025, 3, 1), now) == 6 * 3600
+
+def test_connections_of_finished_threads_are_closed(tmp_path):
+    cache = FlightCache(str(tmp_path / "cache.db"))
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        worker_conns = set(pool.map(lambda _: cache._get_conn(), range(2)))
+    # Opening the next connection closes the ones whose threads have exited
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(cache._get_conn).result()
+    assert len(cache._connections) <= 2
+    for conn in worker_conns:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+def test_unused_cache_is_garbage_collected(tmp_path):
+    cache = FlightCache(str(tmp_path / "cache.db"))
+    conn = cache._get_conn()
+    ref = weakref.ref(cache)
+    del cache
+    gc.collect()
+    assert ref() is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
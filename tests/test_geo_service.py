@@ -0,0 +1,68 @@
+from datetime import datetime
+import numpy as np
+from app.schemas.travel import CarRental
+from app.services.location_service import get_location_service
+from app.services.geo_service import (
+    find_nearest_airport, generate_ground_segments, get_coords, get_coords_bulk, haversine_distance,
+    pairwise_haversine, suggest_ground_transport, _pairwise_haversine_parallel
+)
+
+
+def test_haversine_distance_gru_vcp():
+    assert abs(haversine_distance(-23.4356, -46.4731, -23.0069, -47.1344) - 82.697) < 0.01
+    assert haversine_distance(10.0, 20.0, 10.0, 20.0) == 0.0
+
+def test_pairwise_haversine_kernels_agree():
+    coords = np.array([[-23.4356, -46.4731], [-23.0069, -47.1344], [49.0097, 2.5479], [-37.0081, 174.7917]])
+    expected = pairwise_haversine(coords)
+    parallel = _pairwise_haversine_parallel(np.radians(coords[:, 0]), np.radians(coords[:, 1]))
+    assert np.allclose(expected, parallel)
+    assert np.allclose(expected, expected.T)
+    assert abs(expected[0, 1] - haversine_distance(-23.4356, -46.4731, -23.0069, -47.1344)) < 1e-6
+
+def test_find_nearest_airport_skips_target_city():
+    city, dist = find_nearest_airport("São Paulo")
+    assert city == "Campinas"
+    assert 80 < dist < 85
+
+def test_find_nearest_airport_by_iata():
+    city, dist = find_nearest_airport("GRU")
+    # Congonhas is the closest airport to Guarulhos
+    assert city == "São Paulo"
+    assert 25 < dist < 30
+
+def test_find_nearest_airport_linear_scan_fallback(monkeypatch):
+    monkeypatch.setattr(get_location_service(), "kdtree", None)
+    city, dist = find_nearest_airport("Paris")
+    assert city == "London"
+    assert 300 < dist < 315
+
+def test_find_nearest_airport_unknown_city():
+    assert find_nearest_airport("Ituiutaba") is None
+
+def test_generate_ground_segments_only_drivable_pairs():
+    cars = [CarRental(city="Campinas", company="Localiza", price_per_day=100.0, model="Gol", deep_link="link")]
+    segments = generate_ground_segments(["São Paulo", "Campinas", "Paris", "Ituiutaba"], datetime(2025, 1, 1), cars=cars)
+
+    pairs = {(s.origin, s.destination): s for s in segments}
+    assert set(pairs) == {("São Paulo", "Campinas"), ("Campinas", "São Paulo")}
+
+    seg = pairs[("Campinas", "São Paulo")]
+    assert seg.price == 83.08
+    assert seg.deep_link == "link"
+    assert seg.departure_time == datetime(2025, 1, 1, 8, 0)
+    assert (seg.arrival_time - seg.departure_time).total_seconds() == seg.duration_minutes * 60
+    assert pairs[("São Paulo", "Campinas")].deep_link is None
+
+def test_suggest_ground_transport():
+    assert suggest_ground_transport("Campinas", "São Paulo", 160.0) == \
+        "Car Rental suggested. Drive approx 2.0 hours (160.0 km)."
+    assert suggest_ground_transport("Paris", "Berlin", 900.0).startswith("Distance too far")
+
+def test_get_coords_bulk_matches_get_coords():
+    cities = ["São Paulo", "gig", "CDG", "Ituiutaba"]
+    bulk = get_coords_bulk(cities)
+    assert bulk.shape == (4, 2)
+    for row, city in zip(bulk.tolist(), cities[:3]):
+        assert tuple(row) == get_coords(city)
+    assert np.isnan(bulk[3]).all()
@@ -0,0 +1,56 @@
+from app.services.location_service import get_location_service, MAX_INDEXED_QUERY_LEN
+
+
+def iatas(results):
+    return [a.iata for a in results]
+
+def test_search_exact_iata_first():
+    assert iatas(get_location_service().search("gru"))[0] == "GRU"
+
+def test_search_iata_prefix_then_text():
+    results = iatas(get_location_service().search("a", limit=50))
+    # IATA prefix hits come before city/name substring hits
+    assert results[:6] == ["AEP", "ATL", "AMS", "ARN", "AUH", "AKL"]
+    assert results[6] == "GRU"
+    assert len(results) == len(set(results)) == 50
+
+def test_search_substring_of_city_and_name():
+    service = get_location_service()
+    assert iatas(service.search("paulo")) == ["GRU", "CGH"]
+    assert iatas(service.search("Rio")) == ["GIG", "SDU", "SJP"]
+    assert iatas(service.search("kennedy")) == ["JFK"]
+
+def test_search_long_query_falls_back_to_scan():
+    query = "ingeniero aeronáutico ambrosio"
+    assert len(query) > MAX_INDEXED_QUERY_LEN
+    assert iatas(get_location_service().search(query)) == ["COR"]
+
+def test_search_limit_and_empty():
+    service = get_location_service()
+    assert len(service.search("intl", limit=3)) == 3
+    assert service.search("") == []
+    assert service.search("xyz") == []
+
+def test_resolve_iata():
+    service = get_location_service()
+    assert service.resolve_iata("são paulo") == "GRU"
+    assert service.resolve_iata(" gig ") == "GIG"
+    assert service.resolve_iata("abc") == "ABC"
+    assert service.resolve_iata("Ituiutaba") == "Ituiutaba"
+
+def test_nearest_and_within_km(monkeypatch):
+    service = get_location_service()
+    expected = ["CGH", "GRU", "VCP"]
+    for tree in (service.kdtree, None):
+        monkeypatch.setattr(service, "kdtree", tree)
+        assert iatas(a for a, _ in service.nearest(-23.55, -46.63, k=3)) == expected
+        hits = service.within_km(-23.55, -46.63, 100)
+        assert iatas(a for a, _ in hits) == expected
+        assert all(km <= 100 for _, km in hits)
+    assert service.within_km(0.0, -150.0, 50) == []
+
+def test_search_ignores_diacritics_for_ascii_queries():
+    service = get_location_service()
+    assert iatas(service.search("sao paulo")) == iatas(service.search("São Paulo")) == ["GRU", "CGH"]
+    assert iatas(service.search("goiania")) == ["GYN"]
+    assert service.resolve_iata("Sao Paulo") == "GRU"
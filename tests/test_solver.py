@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+import numpy as np
+from data.models import Flight, Hotel, TravelRequest
+from optimization import solver
+from optimization.solver import solve_itinerary
+
+
+T0 = datetime(2025, 1, 1)
+
+def flight(origin, destination, price, minutes, airline="LATAM"):
+    return Flight(origin, destination, price, minutes, airline, T0, T0 + timedelta(minutes=minutes))
+
+def request(origins, destinations, mandatory=(), weight_cost=1.0, weight_time=0.0, **kwargs):
+    return TravelRequest(list(origins), list(destinations), list(mandatory), 1, 0, T0, weight_cost, weight_time, **kwargs)
+
+def test_solver_keeps_best_scoring_flight_per_edge():
+    flights = [flight("A", "B", 300.0, 60), flight("A", "B", 200.0, 600), flight("A", "B", 200.0, 90, "GOL")]
+    result = solve_itinerary(request(["A"], ["B"]), flights, [], [])
+    assert result["status"] == "Optimal"
+    [leg] = result["itinerary"]
+    # Cheapest fare wins; the first one listed breaks the price tie
+    assert leg["flight"] is flights[1]
+    assert result["total_cost"] == 200.0
+
+    result = solve_itinerary(request(["A"], ["B"], weight_cost=0.0, weight_time=1.0), flights, [], [])
+    assert result["itinerary"][0]["flight"] is flights[0]
+
+def test_held_karp_matches_ilp(monkeypatch):
+    flights = [
+        flight("A", "B", 100.0, 60), flight("B", "C", 100.0, 60), flight("A", "C", 500.0, 60),
+        flight("B", "A", 10.0, 60), flight("C", "A", 10.0, 60), flight("C", "B", 10.0, 60),
+    ]
+    req = request(["A"], ["C"])
+    dp = solve_itinerary(req, flights, [], [])
+    monkeypatch.setattr(solver, "HELD_KARP_MAX_NODES", 0)
+    ilp = solve_itinerary(req, flights, [], [])
+    assert dp["status"] == ilp["status"] == "Optimal"
+    assert [(leg["from"], leg["to"]) for leg in dp["itinerary"]] == [("A", "B"), ("B", "C")]
+    assert dp["total_cost"] == ilp["total_cost"] == 200.0
+
+def test_held_karp_reports_unreachable_destination():
+    result = solve_itinerary(request(["A"], ["C"]), [flight("A", "B", 100.0, 60), flight("C", "A", 100.0, 60)], [], [])
+    assert result["status"] == "Infeasible"
+    assert result["itinerary"] == []
+
+def test_short_route_only_when_provably_optimal():
+    inf = float("inf")
+    cost = np.array([
+        [inf, 100.0, 150.0, 10.0],
+        [inf, inf, inf, inf],
+        [inf, inf, inf, inf],
+        [inf, 20.0, 200.0, inf],
+    ])
+    # Via hub 3 (30) beats the direct edge and no longer route exists
+    assert solver._short_route(cost, 0, 1) == [0, 3, 1]
+    cost[3, 2] = 1.0
+    cost[2, 1] = 1.0
+    # 0 -> 3 -> 2 -> 1 (12) could beat every one- or two-leg route, so defer to the solver
+    assert solver._short_route(cost, 0, 1) is None
+    assert solver._short_route(cost, 2, 2) == [2]
+
+def test_synthetic_edges_fill_missing_hops():
+    flights = [flight("São Paulo", "Campinas", 100.0, 60)]
+    req = request(["São Paulo"], ["Paris"])
+    assert solve_itinerary(req, flights, [], [])["status"] == "Infeasible"
+
+    result = solve_itinerary(req, flights, [], [], synthetic_cost_per_km=0.5)
+    assert result["status"] == "Optimal"
+    [leg] = result["itinerary"]
+    assert leg["flight"] is None
+    assert (leg["from"], leg["to"]) == ("São Paulo", "Paris")
+    assert 4700 < leg["price"] < 4800
+
+def test_subtours_finds_cycles_off_the_path():
+    # Path 0 -> 1 -> 2, plus a 3 <-> 4 cycle and a 5 -> 6 -> 7 -> 5 cycle with a tail into 2
+    chosen = [(0, 1), (1, 2), (3, 4), (4, 3), (5, 6), (6, 7), (7, 5), (7, 2)]
+    assert solver._subtours(chosen, 8) == [[3, 4], [5, 6, 7]]
+    assert solver._subtours([(0, 1), (1, 2)], 3) == []
+
+def test_ilp_solver_falls_back_to_cbc(monkeypatch):
+    monkeypatch.setattr(solver, "HAS_HIGHS", False)
+    assert isinstance(solver._ilp_solver(10), solver.PULP_CBC_CMD)
+
+def test_no_edges_skips_the_solver(monkeypatch):
+    def fail(*args):
+        raise AssertionError("solver should not run")
+    monkeypatch.setattr(solver, "_solve_ilp", fail)
+    monkeypatch.setattr(solver, "held_karp", fail)
+
+    result = solve_itinerary(request(["A"], ["B"], is_round_trip=True), [], [], [])
+    assert (result["status"], result["itinerary"]) == ("Optimal", [])
+    assert solve_itinerary(request(["A"], ["B"]), [], [], [])["status"] == "Infeasible"
+    # B may both start and end the trip
+    assert solve_itinerary(request(["A", "B"], ["C", "B"]), [], [], [])["status"] == "Optimal"
+
+def test_last_hotel_listed_per_city_is_used():
+    hotels = [Hotel("B", "First", 50.0, 4.0), Hotel("Z", "Elsewhere", 10.0, 3.0), Hotel("B", "Last", 80.0, 5.0)]
+    result = solve_itinerary(request(["A"], ["B"], stay_days_per_city=2), [flight("A", "B", 100.0, 60)], hotels, [])
+    assert result["cost_breakdown"]["hotel"] == 160.0
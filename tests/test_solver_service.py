@@ -0,0 +1,48 @@
+from datetime import datetime
+from app.schemas.travel import ItineraryLeg, SolverResult, TravelRequest
+from app.services import solver_service
+from app.services.solver_service import _attach_leg_coords
+
+
+def leg(origin, destination):
+    return ItineraryLeg(origin=origin, destination=destination, flight=None, price=1.0, duration=60)
+
+def test_attach_leg_coords():
+    result = SolverResult(status="Optimal", itinerary=[leg("São Paulo", "Paris"), leg("Paris", "Ituiutaba")],
+                          total_cost=2.0, total_duration=120)
+    _attach_leg_coords(result)
+    first, second = result.itinerary
+    assert first.origin_coords == [-23.4356, -46.4731]
+    assert first.dest_coords == second.origin_coords == [49.0097, 2.5479]
+    # Unknown cities stay without coordinates
+    assert second.dest_coords is None
+
+def test_solve_itinerary_memoizes_identical_requests(monkeypatch):
+    calls = []
+
+    class Response:
+        text = '{"status": "Optimal", "itinerary": [], "total_cost": 0.0, "total_duration": 0}'
+
+        def raise_for_status(self):
+            pass
+
+    def post(url, data, **kwargs):
+        calls.append(data)
+        return Response()
+
+    monkeypatch.setattr(solver_service._session, "post", post)
+    solver_service._cached_post.cache_clear()
+    request = TravelRequest(origin_cities=["São Paulo"], destination_cities=["Paris"], mandatory_cities=[],
+                            pax_adults=1, pax_children=0, start_date=datetime(2025, 1, 1),
+                            weight_cost=1.0, weight_time=0.0)
+    first = solver_service.solve_itinerary(request, [], [], [])
+    second = solver_service.solve_itinerary(request, [], [], [])
+    assert first.status == second.status == "Optimal"
+    assert first is not second
+    assert len(calls) == 1
+    solver_service._cached_post.cache_clear()
+
+def test_price_formatted_is_derived_from_price():
+    data = leg("São Paulo", "Paris").model_copy(update={"price": 1234.5}).model_dump()
+    assert data["price_formatted"] == "R$ 1234.50"
+    assert ItineraryLeg(**data).price == 1234.5